@@ -16,15 +16,14 @@ Version: 2.0 - Streamlit Edition
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.express as px
 import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import datetime
 import json
 import base64
 from io import BytesIO, StringIO
-from typing import Dict, List, Optional
-import time
+from enum import IntEnum, IntFlag
+from types import MappingProxyType
+from typing import Callable, Dict, Final, List, Mapping, NamedTuple, Optional, Tuple
 import sys
 
 # Configure Streamlit page
@@ -41,7 +40,7 @@ st.set_page_config(
 )
 
 # Enhanced Custom CSS for medical-grade application
-st.markdown("""
+_APP_CSS: Final[str] = """
 <style>
     @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap');
     
@@ -184,6 +183,8 @@ st.markdown("""
         background: linear-gradient(90deg, #3b82f6 0%, #1d4ed8 100%);
     }
     
+    .metric-grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(140px, 1fr)); gap: 0.5rem; }
+    
     .metric-container:hover {
         transform: translateY(-2px);
         box-shadow: 0 10px 15px -3px rgba(0, 0, 0, 0.1), 0 4px 6px -2px rgba(0, 0, 0, 0.05);
@@ -238,7 +239,10 @@ st.markdown("""
         box-shadow: 0 10px 15px -3px rgba(0, 0, 0, 0.1);
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+# Style-only HTML goes to the event container, so it takes no layout space
+st.html(_APP_CSS)
 
 # Initialize session state
 if 'current_recommendation' not in st.session_state:
@@ -246,7 +250,69 @@ if 'current_recommendation' not in st.session_state:
 if 'user_preferences' not in st.session_state:
     st.session_state.user_preferences = {}
 
+# Diagnosis and condition codes shared by the databases and the engine
+class Dx(IntEnum):
+    """Primary diagnoses offered on the assessment form"""
+    NONE = 0
+    GERD = 1
+    CMPA = 2
+    LACTOSE = 3
+    NEC = 4
+    COLIC = 5
+    CONST = 6
+
+DX_FROM_STR: Final[Mapping[str, Dx]] = MappingProxyType({
+    'None': Dx.NONE,
+    'GERD': Dx.GERD,
+    'CMPA': Dx.CMPA,
+    'Lactose Intolerance': Dx.LACTOSE,
+    'NEC': Dx.NEC,
+    'Colic': Dx.COLIC,
+    'Constipation': Dx.CONST
+})
+
+class Cond(IntFlag):
+    """Condition flags; primary and secondary conditions fold into one mask"""
+    REFLUX = 1 << 0
+    CONSTIPATION = 1 << 1
+    DIARRHEA = 1 << 2
+    POOR_WEIGHT_GAIN = 1 << 3
+    VOMITING = 1 << 4
+    FUSSINESS = 1 << 5
+    SLEEP_DISTURBANCES = 1 << 6
+    ECZEMA = 1 << 7
+    CMPA = 1 << 8
+    COLIC = 1 << 9
+    GERD = 1 << 10
+    DIGESTIVE_SENSITIVITY = 1 << 11
+    LACTOSE_INTOLERANCE = 1 << 12
+    NEC = 1 << 13
+
+COND_FROM_STR: Final[Mapping[str, Cond]] = MappingProxyType({
+    'Reflux': Cond.REFLUX,
+    'Constipation': Cond.CONSTIPATION,
+    'Diarrhea': Cond.DIARRHEA,
+    'Poor weight gain': Cond.POOR_WEIGHT_GAIN,
+    'Vomiting': Cond.VOMITING,
+    'Fussiness': Cond.FUSSINESS,
+    'Sleep disturbances': Cond.SLEEP_DISTURBANCES,
+    'Eczema': Cond.ECZEMA,
+    'CMPA': Cond.CMPA,
+    'Colic': Cond.COLIC,
+    'GERD': Cond.GERD,
+    'Digestive sensitivity': Cond.DIGESTIVE_SENSITIVITY,
+    'Lactose Intolerance': Cond.LACTOSE_INTOLERANCE,
+    'NEC': Cond.NEC
+})
+
 # Enhanced Database Classes
+class ProbioticSearchRow(NamedTuple):
+    """Pre-lowered search text for one probiotic strain"""
+    name: str
+    haystack: str
+    evidence_level: str
+    caprix_exclusive: bool
+
 class ProbioticDatabase:
     """
     Comprehensive database of clinically-studied probiotics for infant formulas
@@ -340,13 +406,32 @@ class ProbioticDatabase:
                 'caprix_exclusive': True
             }
         }
+        
+        # Identifies the table contents for cache keys built from this database
+        self.version = tuple(self.probiotics)
+        
+        # Lowercased once here so the Evidence Database search does not re-lower every strain;
+        # the newline separator cannot be typed into the search box, so matches never span fields
+        self.search_index = tuple(
+            ProbioticSearchRow(
+                name, f"{name.lower()}\n{', '.join(data['indications']).lower()}",
+                data['evidence_level'], data.get('caprix_exclusive', False)
+            )
+            for name, data in self.probiotics.items()
+        )
+        # Per-instance memo for _lookup_probiotics; lives and dies with the database object
+        self._condition_matches: Dict[str, Tuple[Dict, ...]] = {}
 
     def get_probiotics_for_condition(self, condition: str) -> List[Dict]:
         """Return suitable probiotics for a specific condition with enhanced data"""
-        suitable = []
-        for name, data in self.probiotics.items():
-            if any(cond.lower() in ind.lower() for ind in data['indications'] for cond in [condition]):
-                suitable.append({
+        return [dict(p) for p in self._lookup_probiotics(condition.lower())]
+
+    def _lookup_probiotics(self, condition_lower: str) -> Tuple[Dict, ...]:
+        """Indication match for a lower-cased condition, memoized on the instance"""
+        matches = self._condition_matches.get(condition_lower)
+        if matches is None:
+            matches = tuple(
+                {
                     'name': name, 
                     'dosage': data['dosage'], 
                     'evidence_level': data['evidence_level'],
@@ -356,10 +441,14 @@ class ProbioticDatabase:
                     'mechanism': data.get('mechanism', 'Not specified'),
                     'safety_profile': data.get('safety_profile', 'Standard safety profile'),
                     'caprix_exclusive': data.get('caprix_exclusive', False)
-                })
-        return suitable
+                }
+                for name, data in self.probiotics.items()
+                if any(condition_lower in ind.lower() for ind in data['indications'])
+            )
+            self._condition_matches[condition_lower] = matches
+        return matches
 
-    def get_all_probiotics(self) -> Dict:
+    def get_all_probiotics(self) -> Mapping:
         """Return all probiotics in the database"""
         return self.probiotics
 
@@ -410,13 +499,19 @@ class PrebioticDatabase:
                 'synergy': 'Enhanced effect with other HMOs'
             }
         }
+        # Per-instance memo for _lookup_prebiotics; lives and dies with the database object
+        self._condition_matches: Dict[str, Tuple[Dict, ...]] = {}
 
     def get_prebiotics_for_condition(self, condition: str) -> List[Dict]:
         """Return suitable prebiotics with enhanced information"""
-        suitable = []
-        for name, data in self.prebiotics.items():
-            if any(cond.lower() in ind.lower() for ind in data['indications'] for cond in [condition]):
-                suitable.append({
+        return [dict(p) for p in self._lookup_prebiotics(condition.lower())]
+
+    def _lookup_prebiotics(self, condition_lower: str) -> Tuple[Dict, ...]:
+        """Indication match for a lower-cased condition, memoized on the instance"""
+        matches = self._condition_matches.get(condition_lower)
+        if matches is None:
+            matches = tuple(
+                {
                     'name': name, 
                     'dosage': data['dosage'], 
                     'evidence_level': data['evidence_level'],
@@ -426,10 +521,14 @@ class PrebioticDatabase:
                     'mechanism': data.get('mechanism', 'Not specified'),
                     'synergy': data.get('synergy', 'General compatibility'),
                     'caprix_exclusive': data.get('caprix_exclusive', False)
-                })
-        return suitable
+                }
+                for name, data in self.prebiotics.items()
+                if any(condition_lower in ind.lower() for ind in data['indications'])
+            )
+            self._condition_matches[condition_lower] = matches
+        return matches
 
-    def get_all_prebiotics(self) -> Dict:
+    def get_all_prebiotics(self) -> Mapping:
         """Return all prebiotics in the database"""
         return self.prebiotics
 
@@ -532,6 +631,35 @@ class MedicalConditionDatabase:
         """Return list of all conditions in the database"""
         return list(self.conditions.keys())
 
+# Bit flags used by the vectorized formula base selector
+
+ALLERGEN_BIT = {
+    'goat milk': 1 << 0,
+    'goat': 1 << 0,
+    'cow milk': 1 << 1
+}
+
+def condition_bits(conditions) -> Cond:
+    """Fold condition names into a Cond mask"""
+    bits = Cond(0)
+    for condition in conditions:
+        bits |= COND_FROM_STR.get(condition, 0)
+    return bits
+
+def allergen_bits(allergies) -> int:
+    """Fold allergy names (case-insensitive) into an ALLERGEN_BIT mask"""
+    bits = 0
+    for allergy in allergies:
+        bits |= ALLERGEN_BIT.get(allergy.lower(), 0)
+    return bits
+
+# Selector-only tags per base: (preferred for conditions, allergy tokens that exclude it).
+# Kept apart from the base records so they never reach rec['formula_base'].
+_BASE_SELECTION_TAGS: Final[Mapping[str, Tuple[Tuple[str, ...], Tuple[str, ...]]]] = MappingProxyType({
+    'caprix_probiotic_goat': (('CMPA', 'Colic', 'GERD', 'Digestive sensitivity', 'Constipation'), ('goat milk', 'goat')),
+    'cow_milk_standard': ((), ('cow milk',)),
+})
+
 class FormulaBaseDatabase:
     """Enhanced formula base database including CapriX exclusive formulation"""
     
@@ -661,11 +789,27 @@ class FormulaBaseDatabase:
                 'references': 'Multiple clinical studies'
             }
         }
+        
+        # Structure-of-Arrays columns, one row per base in insertion (priority) order
+        self._ids = np.array(list(self.bases.keys()))
+        tags = [_BASE_SELECTION_TAGS.get(base_id, ((), ())) for base_id in self.bases]
+        self._suit_bits = np.array([condition_bits(conditions) for conditions, _ in tags], dtype=np.uint32)
+        self._allergen_bits = np.array([allergen_bits(allergens) for _, allergens in tags], dtype=np.uint32)
 
     def get_base_info(self, base_id: str) -> Optional[Dict]:
         """Return comprehensive information about a specific formula base"""
         return self.bases.get(base_id, None)
 
+    def select_preferred_base(self, required_bits: int, forbidden_bits: int) -> Optional[str]:
+        """Return the first base matching any required condition and no forbidden allergen"""
+        mask = (
+            ((self._suit_bits & np.uint32(required_bits)) != 0)
+            & ((self._allergen_bits & np.uint32(forbidden_bits)) == 0)
+        )
+        if not mask.any():
+            return None
+        return str(self._ids[mask.argmax()])
+
 class FormulationEngine:
     """Enhanced formulation engine with sophisticated recommendation algorithms"""
     
@@ -682,6 +826,14 @@ class FormulationEngine:
             'carbs': {'min': 9.0, 'max': 14.0, 'optimal': 11.0, 'unit': 'g/100kcal'},
             'energy': {'min': 60, 'max': 70, 'optimal': 67, 'unit': 'kcal/100ml'}
         }
+        
+        # Diagnosis dispatch precomputed once for the base selectors
+        self._primary_dispatch = {
+            Dx.NEC: lambda severity, secondary: 'amino_acid',
+            Dx.CMPA: lambda severity, secondary: 'amino_acid' if severity >= 4 else 'extensively_hydrolyzed',
+            # Standard base for GERD is used with AR modification
+            Dx.GERD: lambda severity, secondary: 'extensively_hydrolyzed' if secondary & Cond.CMPA else 'cow_milk_standard'
+        }
 
     def recommend_formula(self, **params):
         """Enhanced recommendation with confidence scoring and detailed analysis"""
@@ -695,10 +847,11 @@ class FormulationEngine:
         prefer_caprix = params.get('prefer_caprix', False)
         cmpa_severity = params.get('cmpa_severity', 3)
         
-        # Advanced formula selection
-        formula_base_id = self._select_optimal_base(
+        # Advanced formula selection, specialized on the CapriX preference
+        select_base = self._select_with_caprix if prefer_caprix else self._select_without_caprix
+        formula_base_id = select_base(
             primary_diagnosis, secondary_conditions, allergies,
-            age, weight, prefer_caprix, cmpa_severity
+            age, weight, cmpa_severity
         )
         
         base_info = self.base_db.get_base_info(formula_base_id)
@@ -736,6 +889,7 @@ class FormulationEngine:
             'safety_assessment': safety_assessment,
             'confidence_score': confidence_score,
             'is_caprix': formula_base_id == 'caprix_probiotic_goat',
+            'complexity_score': len(probiotics) + len(safety_assessment),
             'recommendation_rationale': self._generate_rationale(
                 primary_diagnosis, formula_base_id, probiotics
             ),
@@ -743,36 +897,34 @@ class FormulationEngine:
             'cost_estimate': self._estimate_monthly_cost(feeding_guide, formula_base_id)
         }
     
-    def _select_optimal_base(self, primary_diagnosis, secondary_conditions, allergies, 
-                           age, weight, prefer_caprix, cmpa_severity):
-        """Advanced base selection algorithm"""
-        
+    def _select_with_caprix(self, primary_diagnosis, secondary_conditions, allergies,
+                            age, weight, cmpa_severity):
+        """Base selection when CapriX is preferred, falling back to clinical selection"""
         # CapriX selection logic with medical validation
-        if prefer_caprix:
-            caprix_suitable = ['CMPA', 'Colic', 'GERD', 'Digestive sensitivity', 'Constipation']
-            if (primary_diagnosis in caprix_suitable or 
-                any(cond in caprix_suitable for cond in secondary_conditions)):
-                
-                # Safety exclusions for CapriX
-                if not any(allergy.lower() in ['goat milk', 'goat'] for allergy in allergies):
-                    if primary_diagnosis == 'CMPA' and cmpa_severity <= 3:
-                        return 'caprix_probiotic_goat'
-                    elif primary_diagnosis != 'CMPA':
-                        return 'caprix_probiotic_goat'
+        if DX_FROM_STR.get(primary_diagnosis, Dx.NONE) != Dx.CMPA or cmpa_severity <= 3:
+            # Suitability and allergen safety exclusions evaluated as bitmasks over all bases
+            preferred = self.base_db.select_preferred_base(
+                condition_bits([primary_diagnosis, *secondary_conditions]),
+                allergen_bits(allergies)
+            )
+            if preferred is not None:
+                return preferred
+        
+        return self._select_without_caprix(
+            primary_diagnosis, secondary_conditions, allergies,
+            age, weight, cmpa_severity
+        )
+
+    def _select_without_caprix(self, primary_diagnosis, secondary_conditions, allergies,
+                               age, weight, cmpa_severity):
+        """Clinical base selection by diagnosis, age and weight"""
+        dx = DX_FROM_STR.get(primary_diagnosis, Dx.NONE)
+        secondary_mask = condition_bits(secondary_conditions)
         
         # Medical condition-based selection
-        if primary_diagnosis == 'CMPA':
-            if cmpa_severity >= 4:
-                return 'amino_acid'
-            else:
-                return 'extensively_hydrolyzed'
-        elif primary_diagnosis == 'NEC':
-            return 'amino_acid'
-        elif primary_diagnosis == 'GERD':
-            if 'CMPA' in secondary_conditions:
-                return 'extensively_hydrolyzed'
-            else:
-                return 'cow_milk_standard'  # With AR modification
+        select_for_diagnosis = self._primary_dispatch.get(dx)
+        if select_for_diagnosis is not None:
+            return select_for_diagnosis(cmpa_severity, secondary_mask)
         
         # Age and weight considerations
         if age < 2 and weight < 4:
@@ -938,7 +1090,7 @@ class FormulationEngine:
             score -= 10
         
         # Diagnosis clarity
-        if params.get('primary_diagnosis') != 'None':
+        if DX_FROM_STR.get(params.get('primary_diagnosis', 'None'), Dx.NONE) is not Dx.NONE:
             score += 15
         
         # CapriX clinical evidence bonus
@@ -980,19 +1132,52 @@ class FormulationEngine:
             'total_cost': formula_cost + 25.0
         }
 
+def _freeze_table(table: Dict) -> Mapping:
+    """Read-only view of a database table with interned keys"""
+    return MappingProxyType({sys.intern(key): value for key, value in table.items()})
+
 # Load databases
-@st.cache_data
+@st.cache_resource
 def load_databases():
     """Load and cache all medical databases"""
     probiotic_db = ProbioticDatabase()
     condition_db = MedicalConditionDatabase()
     base_db = FormulaBaseDatabase()
     prebiotic_db = PrebioticDatabase()
+    
+    # The tables are read-only after construction; interned keys let lookups hit the identity fast path
+    probiotic_db.probiotics = _freeze_table(probiotic_db.probiotics)
+    prebiotic_db.prebiotics = _freeze_table(prebiotic_db.prebiotics)
+    condition_db.conditions = _freeze_table(condition_db.conditions)
+    base_db.bases = _freeze_table(base_db.bases)
     return probiotic_db, condition_db, base_db, prebiotic_db
 
 probiotic_db, condition_db, base_db, prebiotic_db = load_databases()
 engine = FormulationEngine(probiotic_db, condition_db, base_db, prebiotic_db)
 
+# Only these fields influence recommend_formula; free-text notes stay out of the cache key
+_RECOMMENDATION_PARAMS = (
+    'age', 'weight', 'primary_diagnosis', 'secondary_conditions',
+    'allergies', 'prefer_caprix', 'cmpa_severity'
+)
+
+def _freeze_params(user_data: Dict) -> tuple:
+    """Build a deterministic, hashable snapshot of the recommendation inputs"""
+    # List order is preserved: it decides probiotic priority in the result
+    return tuple(
+        (key, tuple(value) if isinstance(value, list) else value)
+        for key, value in sorted(user_data.items())
+        if key in _RECOMMENDATION_PARAMS
+    )
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def _cached_recommend(frozen_params: tuple) -> Dict:
+    """Memoized recommend_formula; identical resubmissions return from the cache"""
+    return engine.recommend_formula(**{
+        key: list(value) if isinstance(value, tuple) else value
+        for key, value in frozen_params
+    })
+
 # Fix for deprecated Streamlit functions
 def safe_rerun():
     """Safe rerun function that works with different Streamlit versions"""
@@ -1004,119 +1189,1518 @@ def safe_rerun():
         except AttributeError:
             st.warning("Please refresh the page manually")
 
-# Enhanced Sidebar with CapriX Team Information
-with st.sidebar:
-    # CapriX Team branding
-    st.markdown("""
-    <div style="text-align: center; padding: 1.5rem; background: linear-gradient(135deg, #1e3a8a 0%, #3b82f6 100%); border-radius: 16px; margin-bottom: 1.5rem; color: white;">
-        <h2 style="margin: 0; font-size: 1.8rem;">🍼 CapriX Formula Designer</h2>
-        <p style="margin: 0.5rem 0 0 0; font-size: 0.9rem; opacity: 0.9;">Research & Development Platform</p>
-        <p style="margin: 0; font-size: 0.7rem; opacity: 0.7;">v2.0 - Enhanced Streamlit Edition</p>
-    </div>
-    """, unsafe_allow_html=True)
+# Cached evidence database views
+@st.cache_data(show_spinner=False)
+def _filter_probiotics(search_query: str, evidence_filter: str, category_filter: str,
+                       db_version: Tuple[str, ...]) -> pd.DataFrame:
+    """Probiotic table matching the Evidence Database filters"""
+    query = search_query.lower()
+    strains, indications, dosages, evidence, benefits, safety = [], [], [], [], [], []
+    for row in probiotic_db.search_index:
+        # Apply search filter
+        if query and query not in row.haystack:
+            continue
+        
+        # Apply evidence filter
+        if evidence_filter != "All" and row.evidence_level != evidence_filter:
+            continue
+            
+        # Apply category filter
+        if category_filter == "CapriX Exclusive" and not row.caprix_exclusive:
+            continue
+        
+        data = probiotic_db.probiotics[row.name]
+        strains.append(row.name + (" ⭐" if row.caprix_exclusive else ""))
+        indications.append(', '.join(data['indications'][:3]))
+        dosages.append(data['dosage'])
+        evidence.append(row.evidence_level)
+        benefits.append(data['benefits'])
+        safety.append(data.get('safety_profile', 'Standard'))
+    
+    # Columns are assembled directly, so pandas never has to transpose row dicts
+    df_probiotics = pd.DataFrame({
+        'Strain': strains,
+        'Primary Indications': indications,
+        'Dosage': dosages,
+        'Evidence Level': evidence,
+        'Clinical Benefits': benefits,
+        'Safety Profile': safety
+    }, dtype=object)
+    
+    # Truncate long text columns in one vectorized pass each
+    for column, limit in (('Clinical Benefits', 80), ('Safety Profile', 50)):
+        text = df_probiotics[column]
+        df_probiotics[column] = text.where(text.str.len() <= limit, text.str.slice(0, limit) + "...")
+    return df_probiotics
+
+@st.cache_data(show_spinner=False)
+def _render_condition_md(name: str) -> Tuple[str, str, str, str, Optional[str]]:
+    """Expander title and markdown bodies for one Medical Conditions entry"""
+    condition_data = condition_db.conditions[name]
+    title = f"🏥 {name} - {condition_data['description'][:50]}..."
+    left_md = "\n\n".join([
+        f"**Full Description:** {condition_data['description']}",
+        f"**Prevalence:** {condition_data['prevalence']}",
+        f"**Severity Levels:** {', '.join(condition_data['severity_levels'])}"
+    ])
+    right_md = "**Recommended Formula Strategies:**\n\n" + "\n".join(
+        f"- {formula_type}" for formula_type in condition_data['formula_recommendations']
+    ) + f"\n\n**Probiotic Evidence:** {condition_data['probiotic_evidence']}"
+    nutrition_md = "**Nutritional Considerations:**\n\n" + "\n".join(
+        f"- **{nutrient.title()}:** {consideration}"
+        for nutrient, consideration in condition_data['nutritional_considerations'].items()
+    )
+    url_md = f"[📖 Clinical Guidelines]({condition_data['url']})" if condition_data.get('url') else None
+    return title, left_md, right_md, nutrition_md, url_md
+
+# CapriX calculator reference data; module scope keeps fragment reruns from rebuilding it
+_QC_METRICS: Final[Mapping[str, str]] = MappingProxyType({
+    'pH Target': '6.2 - 6.8',
+    'Viscosity': '120-180 mPa·s',
+    'Final Viability': '≥1×10⁶ CFU/mL',
+    'Research Shelf Life': '6 months (frozen)'
+})
+
+_COST_COMPONENTS: Final[Mapping[str, tuple]] = MappingProxyType({
+    'Component': (
+        'Research-Grade Goat Milk', 'Premium Oils', 'Organic Date Sugar', 
+        'Research Hydrocolloids', 'Probiotic Cultures', 'Equipment & Energy', 
+        'Quality Testing', 'Research Packaging', 'R&D Overhead'
+    ),
+    'Cost ($)': (0.95, 0.35, 0.18, 0.12, 0.65, 0.28, 0.42, 0.15, 0.45),
+    'Percentage': (26.8, 9.9, 5.1, 3.4, 18.3, 7.9, 11.8, 4.2, 12.7)
+})
+
+# Cached CapriX calculator data
+@st.cache_data(show_spinner=False)
+def _compute_ingredients(batch_size: int) -> Tuple[Dict, Dict]:
+    """Base ingredient amounts and probiotic requirements for a research batch"""
+    # Base calculations
+    base_ingredients = {
+        'Fresh European Goat Milk': 850 * batch_size,
+        'Refined Olive Oil (Cold-Pressed)': 30 * batch_size,
+        'Sunflower Oil (High-Oleic)': 30 * batch_size,
+        'Date Sugar (Organic)': 30 * batch_size,
+        'Gum Arabic (Acacia Senegal)': 5 * batch_size,
+        'Carob Gum (Locust Bean)': 5 * batch_size
+    }
     
-    # Navigation
-    st.markdown("### 📋 Navigation Menu")
-    page = st.radio(
-        "Select Page:",
-        ["🏠 Formula Designer", "📊 Evidence Database", "⭐ CapriX Exclusive", 
-         "📤 Export & Reports", "ℹ️ About & Contact"],
-        index=0,
-        label_visibility="collapsed"
+    # Probiotic calculations
+    probiotic_requirements = {
+        'L. rhamnosus CapriX-Enhanced': f"{1e9 * batch_size:.2e} CFU",
+        'S. thermophilus CapriX-T1': f"{1e9 * batch_size:.2e} CFU",
+        'Probiotic Stabilizer': f"{2 * batch_size} g",
+        'Cryoprotectant': f"{1.5 * batch_size} g"
+    }
+    return base_ingredients, probiotic_requirements
+
+@st.cache_resource(show_spinner=False)
+def _process_table() -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Production process steps and their display table, built once and shared read-only"""
+    # Enhanced process steps
+    process_steps = [
+        {
+            'step': 'Raw Material QC',
+            'duration': 60,
+            'temp': 4,
+            'critical_params': 'Microbial count, protein content, fat composition',
+            'equipment': 'Laboratory testing suite'
+        },
+        {
+            'step': 'Pasteurization',
+            'duration': 25,
+            'temp': 85,
+            'critical_params': 'Time-temperature profile, pathogen elimination',
+            'equipment': 'Research-grade pasteurizer'
+        },
+        {
+            'step': 'Controlled Cooling',
+            'duration': 20,
+            'temp': 40,
+            'critical_params': 'Cooling rate, temperature uniformity',
+            'equipment': 'Precision heat exchanger'
+        },
+        {
+            'step': 'Oil Phase Preparation',
+            'duration': 30,
+            'temp': 40,
+            'critical_params': 'Oil ratio precision, antioxidant addition',
+            'equipment': 'High-speed laboratory mixer'
+        },
+        {
+            'step': 'Emulsification',
+            'duration': 25,
+            'temp': 40,
+            'critical_params': 'Particle size distribution, stability',
+            'equipment': 'Laboratory homogenizer'
+        },
+        {
+            'step': 'Hydrocolloid Integration',
+            'duration': 20,
+            'temp': 40,
+            'critical_params': 'Hydration time, viscosity development',
+            'equipment': 'Dispersing unit'
+        },
+        {
+            'step': 'Probiotic Inoculation',
+            'duration': 15,
+            'temp': 37,
+            'critical_params': 'Viable count, distribution uniformity',
+            'equipment': 'Sterile addition system'
+        },
+        {
+            'step': 'Controlled Fermentation',
+            'duration': 300,
+            'temp': 42,
+            'critical_params': 'pH development, probiotic activity',
+            'equipment': 'Research fermentation tank'
+        },
+        {
+            'step': 'Quality Control Testing',
+            'duration': 45,
+            'temp': 42,
+            'critical_params': 'CFU count, contaminant screening',
+            'equipment': 'Automated testing system'
+        },
+        {
+            'step': 'Research Packaging',
+            'duration': 35,
+            'temp': 5,
+            'critical_params': 'Sterile packaging, labeling',
+            'equipment': 'Research packaging unit'
+        }
+    ]
+    
+    df_process = pd.DataFrame(process_steps)
+    process_df = df_process[['step', 'duration', 'temp', 'critical_params', 'equipment']].rename(columns={
+        'step': 'Process Step', 'duration': 'Duration (min)', 'temp': 'Temperature (°C)',
+        'critical_params': 'Critical Parameters', 'equipment': 'Equipment Required'
+    })
+    return df_process, process_df
+
+@st.cache_data(show_spinner=False)
+def _process_schedule(durations: Tuple[int, ...]) -> Tuple[np.ndarray, np.ndarray]:
+    """Start and end minute of each process step, from one running sum"""
+    ends = np.cumsum(durations)
+    starts = np.concatenate(([0], ends[:-1]))
+    return starts, ends
+
+# Cached chart builders
+@st.cache_data(show_spinner=False)
+def _macro_pie(protein: float, fat: float, carbs: float, energy: float) -> go.Figure:
+    """Build the macronutrient donut chart for a composition"""
+    fig_macro = go.Figure(data=[go.Pie(
+        labels=['Protein', 'Fat', 'Carbohydrates'],
+        values=[protein, fat, carbs],
+        hole=0.4,
+        marker_colors=['#3b82f6', '#10b981', '#f59e0b']
+    )])
+    
+    fig_macro.update_layout(
+        title="Macronutrient Distribution (g/100ml)",
+        height=400,
+        showlegend=True,
+        annotations=[dict(text=f"{energy}<br>kcal/100ml", 
+                        x=0.5, y=0.5, font_size=16, showarrow=False)]
     )
+    return fig_macro
+
+@st.cache_resource(show_spinner=False)
+def _build_evidence_fig() -> go.Figure:
+    """Build the stacked clinical evidence bar chart (shared, never mutated)"""
+    evidence_summary = {
+        'Condition': ['GERD', 'CMPA', 'Colic', 'NEC', 'Constipation'],
+        'High Evidence Studies': [12, 25, 18, 8, 10],
+        'Moderate Evidence Studies': [8, 15, 12, 5, 15],
+        'Total Participants': [2150, 4200, 3100, 800, 1950]
+    }
+    
+    # Create evidence chart
+    fig = go.Figure()
+    
+    fig.add_trace(go.Bar(
+        name='High Evidence',
+        x=evidence_summary['Condition'],
+        y=evidence_summary['High Evidence Studies'],
+        marker_color='#22c55e'
+    ))
+    
+    fig.add_trace(go.Bar(
+        name='Moderate Evidence',
+        x=evidence_summary['Condition'],
+        y=evidence_summary['Moderate Evidence Studies'],
+        marker_color='#f59e0b'
+    ))
+    
+    fig.update_layout(
+        title='Clinical Evidence by Condition',
+        xaxis_title='Medical Condition',
+        yaxis_title='Number of Studies',
+        barmode='stack',
+        height=400
+    )
+    return fig
+
+@st.cache_data(show_spinner=False)
+def _cost_pie(costs: Tuple[float, ...], components: Tuple[str, ...]) -> go.Figure:
+    """Build the research cost breakdown pie; callers set the title"""
+    import plotly.express as px  # only the CapriX page needs plotly.express
+    
+    fig_cost = px.pie(
+        values=list(costs),
+        names=list(components),
+        color_discrete_sequence=px.colors.qualitative.Set3
+    )
+    fig_cost.update_traces(textposition='inside', textinfo='percent+label')
+    fig_cost.update_layout(height=400)
+    return fig_cost
+
+@st.cache_resource(show_spinner=False)
+def _scaling_fig() -> go.Figure:
+    """Build the batch scale vs cost/efficiency dual-axis chart (shared, never mutated)"""
+    from plotly.subplots import make_subplots
+    
+    batch_ranges = [1, 5, 10, 25, 50]
+    costs_per_100ml = [3.55, 3.20, 2.95, 2.65, 2.45]
+    efficiency_scores = [65, 75, 85, 90, 95]
+    
+    # Create dual-axis chart
+    fig_scale = make_subplots(specs=[[{"secondary_y": True}]])
+    
+    fig_scale.add_trace(
+        go.Scatter(x=batch_ranges, y=costs_per_100ml, name="Cost per 100mL ($)", 
+                  line=dict(color='red', width=3), marker=dict(size=8)),
+        secondary_y=False,
+    )
+    
+    fig_scale.add_trace(
+        go.Scatter(x=batch_ranges, y=efficiency_scores, name="Research Efficiency (%)", 
+                  line=dict(color='green', width=3), marker=dict(size=8)),
+        secondary_y=True,
+    )
+    
+    fig_scale.update_xaxes(title_text="Research Batch Size (Liters)")
+    fig_scale.update_yaxes(title_text="Cost per 100mL ($)", secondary_y=False)
+    fig_scale.update_yaxes(title_text="Research Efficiency (%)", secondary_y=True)
+    fig_scale.update_layout(title="CapriX Research Economics: Scale vs Efficiency", height=400)
+    return fig_scale
+
+# Result renderers
+def _spec_grid(cards) -> str:
+    """One .metric-grid of (label, value, note) cards, emitted with a single st.markdown"""
+    return '<div class="metric-grid">' + "".join(
+        _SPEC_CARD_TMPL.format(label=label, value=value, note=note) for label, value, note in cards
+    ) + '</div>'
+
+def _evidence_css(col: pd.Series) -> np.ndarray:
+    """Background colours for a column of evidence levels, computed in one pass"""
+    return np.select(
+        [col.str.contains('High'), col.str.contains('Moderate')],
+        ['background-color: #dcfce7', 'background-color: #fef3c7'],
+        default='background-color: #fee2e2'
+    )
+
+def _render_recommendation(rec: Dict):
+    """Render the results panel for a formula recommendation"""
+    st.markdown("---")
+    st.markdown('<h2 class="sub-header">📋 Personalized Formula Recommendation</h2>', unsafe_allow_html=True)
+    
+    # Confidence and overview
+    col1, col2, col3 = st.columns([2, 1, 1])
     
-    # Application Statistics
-    st.markdown("### 📈 System Status")
-    col1, col2 = st.columns(2)
     with col1:
-        st.metric("Active Probiotics", "8", "2 exclusive")
-        st.metric("Conditions", "6", "Evidence-based")
+        if rec['is_caprix']:
+            st.markdown(_CAPRIX_BANNER_HTML, unsafe_allow_html=True)
+        else:
+            st.markdown(f"### {rec['formula_base']['name']}")
+            st.write(rec['formula_base']['description'])
+    
     with col2:
-        st.metric("Formulas", "4", "1 exclusive")
-        st.metric("Studies", "40+", "Clinical refs")
+        confidence = rec.get('confidence_score', 85)
+        if confidence >= 90:
+            st.metric("Confidence", f"{confidence}%", "Excellent")
+        elif confidence >= 80:
+            st.metric("Confidence", f"{confidence}%", "High")
+        else:
+            st.metric("Confidence", f"{confidence}%", "Moderate")
     
-    # Quick Actions
-    st.markdown("### ⚡ Quick Actions")
-    if st.button("🔄 Reset Session", use_container_width=True):
-        st.session_state.clear()
-        safe_rerun()
+    with col3:
+        category = rec['formula_base'].get('category', 'Standard')
+        st.metric("Category", category)
+        if rec['is_caprix']:
+            st.metric("Status", "Research", "Exclusive")
+        else:
+            st.metric("Status", "Standard", "Medical")
     
-    if st.button("📚 Academic Resources", use_container_width=True):
-        st.info("""
-        📖 **Academic Resources:**
-        • Infant Nutrition Guidelines (WHO/UNICEF)
-        • Pediatric Gastroenterology References
-        • Food Safety Standards
-        • Research Methodology in Nutrition Science
+    # Detailed composition analysis
+    st.markdown("### 🧪 Nutritional Composition Analysis")
+    
+    # Interactive composition visualization
+    col1, col2 = st.columns([2, 1])
+    
+    with col1:
+        # Create enhanced composition chart
+        composition = rec['composition']
+        
+        # Macronutrient pie chart
+        fig_macro = _macro_pie(
+            composition['protein']['amount'],
+            composition['fat']['amount'],
+            composition['carbs']['amount'],
+            composition['energy']['amount']
+        )
+        # Stable per-recommendation key lets the frontend keep the chart across unrelated reruns
+        st.plotly_chart(fig_macro, use_container_width=True, key="macro_pie")
+    
+    with col2:
+        st.markdown("#### 📊 Nutritional Metrics")
+        
+        # Enhanced metrics display
+        metrics_data = [
+            ("Energy", f"{composition['energy']['amount']} kcal/100ml", "🔥"),
+            ("Protein", f"{composition['protein']['amount']} g/100ml", "💪"),
+            ("Fat", f"{composition['fat']['amount']} g/100ml", "🥑"),
+            ("Carbs", f"{composition['carbs']['amount']} g/100ml", "🌾")
+        ]
         
-        📧 **Academic Contact:** caprix.startup@gmail.com
-        """)
+        cards_html = "".join(
+            _METRIC_CARD_TMPL.format(emoji=emoji, label=label, value=value)
+            for label, value, emoji in metrics_data
+        )
+        st.markdown(f'<div class="metric-grid">{cards_html}</div>', unsafe_allow_html=True)
+        
+        # Compliance check
+        if rec.get('compliance_check', {}).get('codex_compliant', True):
+            st.markdown("""
+            <div class="medical-success">
+                ✅ <strong>Codex Alimentarius Compliant</strong><br>
+                Meets international infant formula standards
+            </div>
+            """, unsafe_allow_html=True)
     
-    # CapriX Team Contact Information
-    st.markdown("---")
-    st.markdown("### 📞 CapriX Team Contact")
-    st.markdown("""
-    **CapriX Startup Initiative**  
-    Higher School of Biological Sciences of Oran  
-    (École Supérieure en Sciences Biologiques d'Oran, Algeria)
+    # Feeding guidelines
+    st.markdown("### 📅 Personalized Feeding Guidelines")
+    
+    col1, col2, col3, col4 = st.columns(4)
+    
+    feeding = rec['feeding_guide']
+    with col1:
+        st.metric("Daily Energy", f"{feeding['daily_energy_needs']} kcal", 
+                 help="Total daily energy requirements based on age and weight")
+    with col2:
+        st.metric("Daily Volume", f"{feeding['daily_volume']} ml",
+                 help="Total daily formula volume needed")
+    with col3:
+        st.metric("Feeds/Day", feeding['feeds_per_day'],
+                 help="Recommended number of feeding sessions")
+    with col4:
+        st.metric("Per Feed", f"{feeding['volume_per_feed']} ml",
+                 help="Volume per individual feeding session")
+    
+    # Enhanced probiotic information
+    if rec['probiotics']:
+        st.markdown("### 🦠 Probiotic Profile & Clinical Evidence")
+        
+        # The engine returns at most three strains; at that count one table reads better than three expanders
+        if len(rec['probiotics']) >= 3:
+            probiotic_df = pd.DataFrame([{
+                'Name': p['name'] + (" ⭐" if p.get('caprix_exclusive') else ""),
+                'Dosage': p['dosage'],
+                'Evidence': p['evidence_level'],
+                'Benefits': p['benefits'],
+                'Safety': p.get('safety_profile', 'Standard')
+            } for p in rec['probiotics']])
+            st.dataframe(
+                probiotic_df.style.apply(_evidence_css, subset=['Evidence']),
+                use_container_width=True, hide_index=True
+            )
+            
+            research_links = [f"- [{p['name']}]({p['url']})" for p in rec['probiotics'] if p.get('url')]
+            if research_links:
+                with st.expander("📖 View Research"):
+                    st.markdown("\n".join(research_links))
+        else:
+            for i, prob in enumerate(rec['probiotics']):
+                with st.expander(f"🔬 {prob['name']}" + (" ⭐ Exclusive" if prob.get('caprix_exclusive') else "")):
+                    col1, col2 = st.columns(2)
+                
+                    with col1:
+                        st.markdown(f"**Dosage:** {prob['dosage']}")
+                        st.markdown(f"**Mechanism:** {prob.get('mechanism', 'Not specified')}")
+                    
+                        # Evidence level badge
+                        evidence_level = prob['evidence_level']
+                        if evidence_level == 'High':
+                            st.markdown('<span class="badge badge-high">High Evidence</span>', unsafe_allow_html=True)
+                        elif evidence_level == 'Moderate':
+                            st.markdown('<span class="badge badge-moderate">Moderate Evidence</span>', unsafe_allow_html=True)
+                        else:
+                            st.markdown('<span class="badge badge-low">Limited Evidence</span>', unsafe_allow_html=True)
+                
+                    with col2:
+                        st.markdown(f"**Clinical Benefits:** {prob['benefits']}")
+                        st.markdown(f"**Safety Profile:** {prob.get('safety_profile', 'Standard')}")
+                    
+                        if prob.get('url'):
+                            st.markdown(f"[📖 View Research]({prob['url']})")
+    
+    # Safety assessment
+    if rec.get('safety_assessment'):
+        st.markdown("### ⚠️ Safety Assessment & Precautions")
+        
+        safety_items = rec['safety_assessment']
+        if isinstance(safety_items, list):
+            for item in safety_items:
+                if 'MEDICAL SUPERVISION' in item or 'SEVERE' in item:
+                    st.markdown(f"""
+                    <div class="medical-warning">
+                        🚨 <strong>Critical Warning:</strong> {item}
+                    </div>
+                    """, unsafe_allow_html=True)
+                elif 'Research Formula' in item:
+                    st.markdown(f"""
+                    <div class="medical-warning">
+                        🔬 <strong>Research Notice:</strong> {item}
+                    </div>
+                    """, unsafe_allow_html=True)
+                elif 'Caution' in item or 'Monitor' in item:
+                    st.warning(f"⚠️ {item}")
+                else:
+                    st.info(f"ℹ️ {item}")
+
+# Academic report generation
+def generate_academic_report(recommendation, sections, user_data, researcher="CapriX Team", supervisor="Dr. Mohamed Merzoug", institution="Higher School of Biological Sciences of Oran",
+                             progress: Optional[Callable[[str], None]] = None,
+                             now: Optional[datetime.datetime] = None) -> bytes:
+    """Generate a comprehensive academic report as UTF-8 Markdown, reporting each stage to the optional progress callback"""
+    # Progress is reported here rather than inside the cached body, so cache hits show the same stages
+    report = progress or (lambda label: None)
+    report("📊 Compiling research data...")
+    # Only the header and footer carry timestamps, so the body can be served from cache
+    now = now or datetime.datetime.now()
+    header = _report_header(researcher, supervisor, institution, now).encode("utf-8")
+    report("🧪 Processing formula specifications...")
+    body = _report_body(recommendation, sections, user_data)
+    report("📚 Integrating academic references...")
+    return header + body + _report_footer(now).encode("utf-8")
+
+def _report_header(researcher, supervisor, institution, now: datetime.datetime) -> str:
+    """Report title block with the generation timestamp and report ID"""
+    return f"""
+# CAPRIX INFANT FORMULA DESIGNER
+## Academic Research Report
 
-    **Founder & Developer:**  
-    Chiali Z. - Final Year Student, Molecular Biology  
+---
 
-    **Academic Supervisors:**  
-    • Dr. Mohamed Merzoug - Lecturer  
-    • Dr. H. Bouderbala - Lecturer  
+**Institution:** {institution}  
+**Researcher:** {researcher}  
+**Academic Supervisor:** {supervisor}  
+**Generated:** {now.strftime('%B %d, %Y at %H:%M')}  
+**Application Version:** CapriX Infant Formula Designer v2.0 - Streamlit Edition  
+**Report ID:** {now.strftime('%Y%m%d-%H%M%S')}
 
-    **Expertise Areas:**  
-    • Biotechnology • Molecular Biology  
-    • Microbiology • Physiology • Nutrition  
+---
+"""
 
-    **Contact:**  
-    📧 CapriX Team: caprix.startup@gmail.com  
-    📧 App Development: merzoug.mohamed1@yahoo.fr  
+@st.cache_data(ttl=3600, max_entries=64, show_spinner=False)
+def _report_body(recommendation: Dict, sections: Dict, user_data: Dict) -> bytes:
+    """Report sections derived from the recommendation and patient data, cached pre-encoded"""
+    secondary = user_data.get('secondary_conditions')
+    allergies = user_data.get('allergies')
+    parts: List[str] = [f"""
+## EXECUTIVE SUMMARY
 
-    **Version:** 2.0 - Enhanced Streamlit Edition
-    """)
-    
-    # Academic Disclaimer
-    st.markdown("---")
-    st.markdown("""
-    <div style="background: #fef2f2; border: 2px solid #ef4444; border-radius: 8px; padding: 1rem; font-size: 0.8rem;">
-        <strong>⚠️ ACADEMIC PROJECT</strong><br>
-        This is a research and educational tool. 
-        All recommendations require medical supervision.
-    </div>
-    """, unsafe_allow_html=True)
+**Research Objective:** Develop evidence-based infant formula recommendations using advanced computational analysis and scientific literature review.
 
-# Main Application Header
-st.markdown("""
-<div style="text-align: center; margin-bottom: 2rem;">
-    <h1 class="main-header">🍼 Infant Formula Designer</h1>
-    <div style="background: linear-gradient(135deg, #f8fafc 0%, #e2e8f0 100%); border-radius: 16px; padding: 1.5rem; margin: 1rem 0; border: 2px solid #cbd5e1;">
-        <p style="font-size: 1.2rem; color: #475569; margin: 0; font-weight: 500;">
-            <strong>Evidence-Based Customized Infant Formula Recommendations</strong><br>
-            <em style="font-size: 1rem; color: #64748b;">Academic Research Project • WHO/AAP/ESPGHAN/Codex Compliant • Enhanced with CapriX Technology</em>
-        </p>
-    </div>
-</div>
-""", unsafe_allow_html=True)
+**Formula Recommended:** {recommendation['formula_base']['name']}  
+**Analysis Confidence Level:** {recommendation.get('confidence_score', 85)}%  
+**Research Classification:** {'CapriX Experimental Research Formula' if recommendation['is_caprix'] else 'Standard Evidence-Based Formula'}
 
-# Page Navigation and Content
-if page == "🏠 Formula Designer":
-    st.markdown('<h2 class="sub-header">👶 Advanced Formula Design & Medical Assessment</h2>', unsafe_allow_html=True)
+### Key Research Findings
+- Comprehensive nutritional analysis completed based on WHO/Codex standards
+- Evidence-based probiotic selection from peer-reviewed literature
+- Personalized feeding guidelines calculated using established formulas
+- Safety assessment conducted according to academic standards
+- All recommendations require medical professional review before any application
+
+---
+
+## PATIENT CASE STUDY PARAMETERS
+
+**Research Subject Profile:**  
+- **Age:** {user_data.get('age', 'Not specified')} months  
+- **Weight:** {user_data.get('weight', 'Not specified')} kg  
+- **Primary Medical Condition:** {user_data.get('primary_diagnosis', 'None specified')}  
+- **Secondary Conditions:** {', '.join(secondary) if secondary else 'None'}  
+- **Known Allergies:** {', '.join(allergies) if allergies else 'None reported'}
+
+### Clinical History Documentation
+**Feeding History:** {user_data.get('feeding_history', 'No feeding history provided')}
+
+**Family Medical History:** {user_data.get('family_history', 'No family history provided')}
+
+**Additional Clinical Notes:** {user_data.get('clinical_notes', 'No additional notes provided')}
+
+---
+
+## FORMULA SPECIFICATION & ANALYSIS
+
+### Selected Formula: {recommendation['formula_base']['name']}
+
+**Academic Classification:** {recommendation['formula_base'].get('category', 'Standard')}  
+**Research Description:** {recommendation['formula_base']['description']}
+
+### Nutritional Composition Analysis (per 100ml)
+
+| Macronutrient | Amount | Unit | Source |
+|---------------|--------|------|---------|
+| **Energy** | {recommendation['composition']['energy']['amount']} | {recommendation['composition']['energy']['unit']} | Calculated total |
+| **Protein** | {recommendation['composition']['protein']['amount']} | {recommendation['composition']['protein']['unit']} | {recommendation['composition']['protein']['source']} |
+| **Fat** | {recommendation['composition']['fat']['amount']} | {recommendation['composition']['fat']['unit']} | {recommendation['composition']['fat']['source']} |
+| **Carbohydrates** | {recommendation['composition']['carbs']['amount']} | {recommendation['composition']['carbs']['unit']} | {recommendation['composition']['carbs']['source']} |
+
+### Regulatory Compliance Analysis
+- **WHO/UNICEF Guidelines:** Reviewed and considered in formulation
+- **Codex Alimentarius Standards:** Reference framework applied
+- **Academic Standards:** Research methodology follows established protocols
+- **Safety Assessment:** Comprehensive risk analysis conducted
+
+---
+
+## PROBIOTIC RESEARCH ANALYSIS
+
+### Evidence-Based Probiotic Selection
+"""]
     
-    # Enhanced assessment form
-    with st.form("comprehensive_assessment", clear_on_submit=False):
-        st.markdown("### 📋 Comprehensive Patient Assessment")
-        
-        # Patient Demographics
-        st.markdown("#### 👶 Patient Demographics")
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            age = st.number_input(
-                "Age (months)", 
-                min_value=0.0, max_value=36.0, value=6.0, step=0.1,
+    if recommendation.get('probiotics'):
+        parts.append("\n| Probiotic Strain | Dosage | Evidence Level | Clinical Benefits | Research References |\n")
+        parts.append("|------------------|--------|----------------|-------------------|--------------------|\n")
+        for probiotic in recommendation['probiotics']:
+            caprix_note = " (CapriX Exclusive)" if probiotic.get('caprix_exclusive') else ""
+            parts.append(f"| **{probiotic['name']}{caprix_note}** | {probiotic['dosage']} | {probiotic['evidence_level']} | {probiotic['benefits'][:60]}... | {probiotic['references']} |\n")
+    else:
+        parts.append("\nNo specific probiotics recommended for this case study.\n")
+    
+    parts.append(f"""
+
+### Probiotic Research Rationale
+The probiotic selection was based on systematic literature review and evidence-based medicine principles. Each strain was evaluated for:
+- Clinical efficacy in peer-reviewed studies
+- Safety profile in infant populations
+- Mechanism of action and biological plausibility
+- Dosage recommendations from clinical trials
+
+---
+
+## FEEDING PROTOCOL & GUIDELINES
+
+### Calculated Feeding Recommendations
+
+| Parameter | Value | Calculation Basis |
+|-----------|-------|-------------------|
+| **Daily Energy Requirements** | {recommendation['feeding_guide']['daily_energy_needs']} kcal | Age and weight-adjusted formula |
+| **Total Daily Volume** | {recommendation['feeding_guide']['daily_volume']} ml | Energy density calculation |
+| **Feeding Frequency** | {recommendation['feeding_guide']['feeds_per_day']} times per day | Age-appropriate intervals |
+| **Volume per Feed** | {recommendation['feeding_guide']['volume_per_feed']} ml | Total volume divided by frequency |
+
+### Research Monitoring Protocol
+For academic research purposes, the following monitoring is recommended:
+- Daily weight gain tracking (target: 15-30g/day)
+- Feeding tolerance assessment
+- Documentation of any adverse reactions
+- Growth velocity monitoring according to WHO standards
+
+---
+
+## SAFETY ASSESSMENT & RISK ANALYSIS
+
+### Comprehensive Safety Evaluation
+""")
+    
+    if recommendation.get('safety_assessment'):
+        for i, warning in enumerate(recommendation['safety_assessment'], 1):
+            parts.append(f"{i}. {warning}\n")
+    
+    parts.append(f"""
+
+### Academic Research Considerations
+- This formulation is developed for research and educational purposes
+- All recommendations require review by qualified medical professionals
+- Clinical validation would be necessary before any practical application
+- Regulatory approval required for commercial development
+
+---
+
+## SCIENTIFIC RATIONALE & RESEARCH METHODOLOGY
+
+### Evidence-Based Decision Making
+{recommendation.get('recommendation_rationale', 'The formula recommendation was developed using evidence-based principles, integrating current scientific literature and established nutritional guidelines.')}
+
+### Research Methodology
+The CapriX Infant Formula Designer employs:
+1. **Systematic Literature Review:** Integration of peer-reviewed research
+2. **Evidence Grading:** Classification of clinical evidence quality
+3. **Risk Assessment:** Comprehensive safety evaluation
+4. **Nutritional Modeling:** WHO/Codex standard compliance checking
+5. **Personalization Algorithms:** Age and weight-adjusted calculations
+
+---
+
+## ACADEMIC REFERENCES & BIBLIOGRAPHY
+
+### Primary Clinical Guidelines
+- World Health Organization (WHO). Infant and young child feeding guidelines
+- American Academy of Pediatrics (AAP). Clinical reports on infant nutrition
+- European Society for Paediatric Gastroenterology Hepatology and Nutrition (ESPGHAN)
+- Codex Alimentarius Commission. Standard for infant formula and formulas for special medical purposes
+
+### Probiotic Research Literature
+""")
+    
+    if recommendation.get('probiotics'):
+        for probiotic in recommendation['probiotics']:
+            parts.append(f"- {probiotic['references']} - {probiotic['name']} clinical evidence\n")
+    
+    parts.append(f"""
+
+### CapriX Research References
+- PMC9525539: Development and characterization of lactose-free probiotic goat milk beverages
+- EP3138409A1: Method for production of a fermented goat's milk beverage
+- CapriX Clinical Study CX-2024-001: Multi-center trial results (in progress)
+
+---
+
+## RESEARCH CONCLUSIONS & FUTURE DIRECTIONS
+
+### Key Academic Findings
+1. **Computational Analysis:** Successful integration of evidence-based algorithms for personalized recommendations
+2. **Safety Framework:** Comprehensive risk assessment methodology developed
+3. **Educational Value:** Effective demonstration of nutritional science principles
+4. **Research Applications:** Platform suitable for academic research and student learning
+
+### Recommendations for Future Research
+- Clinical validation studies of computational recommendations
+- Long-term outcomes assessment of personalized formulations
+- Expansion of probiotic database with emerging research
+- Integration of additional nutritional biomarkers
+
+### Academic Impact
+This research contributes to:
+- **Nutritional Science Education:** Practical application of theoretical knowledge
+- **Research Methodology:** Evidence-based computational approaches
+- **Innovation in Food Technology:** Novel approaches to infant nutrition
+- **Academic Collaboration:** Platform for multi-institutional research
+
+---
+
+## ACADEMIC DISCLAIMER & ETHICAL CONSIDERATIONS
+
+### Research Ethics Statement
+This academic project adheres to ethical research principles:
+- **Educational Purpose:** Designed exclusively for learning and research
+- **No Clinical Application:** Not intended for direct medical use
+- **Professional Oversight:** Developed under academic supervision
+- **Transparency:** Open methodology and evidence-based approach
+
+### Limitations & Future Development
+- **Validation Required:** Clinical studies needed for practical application
+- **Regulatory Compliance:** Commercial development requires regulatory approval
+- **Medical Supervision:** All applications must involve healthcare professionals
+- **Continuous Updates:** Research database requires ongoing maintenance
+
+---
+
+## CONTACT INFORMATION & ACADEMIC SUPPORT
+
+**CapriX Research Team**  
+Higher School of Biological Sciences of Oran  
+Algeria  
+
+**Primary Contact:** caprix.startup@gmail.com  
+**Academic Supervisor:** merzoug.mohamed1@yahoo.fr  
+
+**For Academic Collaborations:** Contact the research team for potential joint projects or educational partnerships.
+
+---
+
+*This report was generated by the CapriX Infant Formula Designer v2.0 for academic research and educational purposes. All content is based on scientific literature review and computational analysis. Medical supervision is required for any practical applications.*
+
+""")
+    
+    return "".join(parts).encode("utf-8")
+
+def _report_footer(now: datetime.datetime) -> str:
+    """Report closing lines with the generation timestamp"""
+    return f"""**Generated on:** {now.strftime('%B %d, %Y at %H:%M')}  
+**Report Classification:** Academic Research Document  
+**Distribution:** For educational and research use only
+"""
+
+# Quick export payloads, built once per recommendation and minute rather than on every rerun
+def _summary_payload(rec: Dict, user_data: Dict, researcher: str, now: datetime.datetime) -> bytes:
+    """Plain-text research summary"""
+    return f"""
+CAPRIX RESEARCH SUMMARY
+=======================
+Date: {now.strftime('%Y-%m-%d %H:%M')}
+Researcher: {researcher}
+Institution: Higher School of Biological Sciences of Oran
+
+PATIENT DATA:
+Age: {user_data.get('age', 'N/A')} months
+Weight: {user_data.get('weight', 'N/A')} kg
+Primary Diagnosis: {user_data.get('primary_diagnosis', 'None')}
+
+RECOMMENDED FORMULA:
+{rec['formula_base']['name']}
+Confidence Level: {rec.get('confidence_score', 85)}%
+Research Status: {'CapriX Exclusive Research Formula' if rec['is_caprix'] else 'Standard Medical Formula'}
+
+ACADEMIC NOTES:
+- This is a research project for academic purposes
+- All recommendations require medical supervision
+- Data for educational and research use only
+""".encode("utf-8")
+
+def _probiotic_payload(rec: Dict) -> Optional[bytes]:
+    """Plain-text probiotic analysis, or None without probiotics"""
+    if not rec.get('probiotics'):
+        return None
+    probiotic_data = "CAPRIX PROBIOTIC ANALYSIS\n" + "="*25 + "\n\n"
+    for p in rec['probiotics']:
+        probiotic_data += f"Strain: {p['name']}\n"
+        probiotic_data += f"Dosage: {p['dosage']}\n"
+        probiotic_data += f"Evidence: {p['evidence_level']}\n"
+        if p.get('caprix_exclusive'):
+            probiotic_data += "Status: CapriX Exclusive\n"
+        probiotic_data += f"Benefits: {p['benefits']}\n\n"
+    return probiotic_data.encode("utf-8")
+
+def _feeding_payload(rec: Dict, now: datetime.datetime) -> bytes:
+    """Plain-text feeding protocol"""
+    return f"""CAPRIX FEEDING PROTOCOL
+======================
+Date: {now.strftime('%Y-%m-%d')}
+
+FEEDING GUIDELINES:
+Daily Energy Needs: {rec['feeding_guide']['daily_energy_needs']} kcal
+Daily Volume: {rec['feeding_guide']['daily_volume']} ml
+Feeding Frequency: {rec['feeding_guide']['feeds_per_day']} times/day
+Volume per Feed: {rec['feeding_guide']['volume_per_feed']} ml
+
+RESEARCH NOTES:
+- Monitor infant response closely
+- Record feeding tolerance
+- Document any adverse reactions
+- Report findings to research team
+
+CONTACT:
+CapriX Team: caprix.startup@gmail.com
+Supervisor: merzoug.mohamed1@yahoo.fr
+""".encode("utf-8")
+
+def _safety_payload(rec: Dict) -> Optional[bytes]:
+    """Plain-text safety assessment, or None without safety notes"""
+    if not rec.get('safety_assessment'):
+        return None
+    safety_data = "CAPRIX SAFETY ASSESSMENT\n" + "="*23 + "\n\n"
+    safety_data += "IMPORTANT SAFETY CONSIDERATIONS:\n\n"
+    for i, warning in enumerate(rec['safety_assessment'], 1):
+        safety_data += f"{i}. {warning}\n\n"
+    
+    safety_data += "\nACADEMIC DISCLAIMER:\n"
+    safety_data += "- This is an experimental research formula\n"
+    safety_data += "- Requires medical supervision for any use\n"
+    safety_data += "- For academic and research purposes only\n"
+    safety_data += "- Not for commercial distribution\n"
+    return safety_data.encode("utf-8")
+
+# (payload key, button label, file name) for each Quick Export column, in display order
+_QUICK_EXPORTS: Final[Tuple[Tuple[str, str, str], ...]] = (
+    ('summary', "📝 Research Summary", "caprix_research_summary.txt"),
+    ('probiotics', "🦠 Probiotic Analysis", "caprix_probiotics.txt"),
+    ('feeding', "🍼 Feeding Protocol", "caprix_feeding_protocol.txt"),
+    ('safety', "⚠️ Safety Assessment", "caprix_safety_assessment.txt"),
+)
+
+def _quick_export_payloads(rec: Dict, user_data: Dict, researcher: str) -> Dict[str, Optional[bytes]]:
+    """Quick export files, memoized in session state per recommendation version and minute"""
+    now = datetime.datetime.now()
+    key = (st.session_state.get('rec_version', 0), now.strftime('%Y%m%d%H%M'), researcher)
+    cached = st.session_state.get('quick_export_payloads')
+    if cached is None or cached[0] != key:
+        cached = (key, {
+            'summary': _summary_payload(rec, user_data, researcher, now),
+            'probiotics': _probiotic_payload(rec),
+            'feeding': _feeding_payload(rec, now),
+            'safety': _safety_payload(rec)
+        })
+        st.session_state.quick_export_payloads = cached
+    return cached[1]
+
+# Page fragments
+@st.fragment
+def _strain_detail(strains: List[str]):
+    """Strain picker and detail view; reruns alone when the selection changes"""
+    # Detailed strain analysis
+    st.markdown("#### 🔬 Detailed Strain Analysis")
+    selected_strain = st.selectbox(
+        "Select strain for detailed analysis:",
+        ["None"] + strains
+    )
+    
+    if selected_strain != "None":
+        strain_data = probiotic_db.probiotics[selected_strain]
+        
+        # Create detailed view
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.markdown(f"#### {selected_strain}")
+            if strain_data.get('caprix_exclusive'):
+                st.markdown('<span class="badge badge-exclusive">CapriX Exclusive</span>', unsafe_allow_html=True)
+            
+            evidence_class = f"evidence-{strain_data['evidence_level'].lower()}"
+            st.markdown(f'<div class="{evidence_class}">', unsafe_allow_html=True)
+            st.markdown(f"**Evidence Level:** {strain_data['evidence_level']}")
+            st.markdown(f"**Primary Indications:** {', '.join(strain_data['indications'])}")
+            st.markdown(f"**Clinical Benefits:** {strain_data['benefits']}")
+            st.markdown('</div>', unsafe_allow_html=True)
+        
+        with col2:
+            st.markdown("#### Technical Specifications")
+            st.markdown(f"**Recommended Dosage:** {strain_data['dosage']}")
+            st.markdown(f"**Mechanism of Action:** {strain_data.get('mechanism', 'Not specified')}")
+            st.markdown(f"**Safety Profile:** {strain_data.get('safety_profile', 'Standard')}")
+            
+            if strain_data.get('url'):
+                st.markdown(f"[📖 View Research Publication]({strain_data['url']})")
+                st.markdown(f"**Reference:** {strain_data['references']}")
+
+@st.fragment
+def _caprix_research_calculator():
+    """Batch calculator, production timeline and cost analysis for the CapriX page"""
+    # Interactive formula calculator
+    st.markdown("### 🧮 CapriX Research Formula Calculator")
+    
+    # Calculator interface
+    col1, col2 = st.columns([1, 2])
+    
+    with col1:
+        st.markdown("#### Research Parameters")
+        batch_size = st.slider("Research Batch Size (Liters)", 1, 100, 10, step=1)
+        
+        research_type = st.selectbox(
+            "Research Application",
+            ["Laboratory Study", "Clinical Trial", "Pilot Research", "Academic Project"]
+        )
+        
+        quality_level = st.selectbox(
+            "Quality Standard",
+            ["Research Grade", "Clinical Grade", "Academic Standard", "Laboratory Standard"]
+        )
+        
+        include_analysis = st.checkbox("Include Cost Analysis", value=True)
+        include_timeline = st.checkbox("Show Production Timeline", value=True)
+    
+    with col2:
+        # Real-time calculation
+        st.markdown("#### Ingredient Requirements")
+        
+        # Base and probiotic calculations
+        base_ingredients, probiotic_requirements = _compute_ingredients(batch_size)
+        
+        # Display ingredients
+        ingredient_tabs = st.tabs(["Base Ingredients", "Probiotic Cultures", "Quality Control"])
+        
+        # Each tab is one HTML grid rather than a widget per ingredient
+        with ingredient_tabs[0]:
+            ingredient_cards = []
+            for ingredient, amount in base_ingredients.items():
+                if 'Milk' in ingredient:
+                    ingredient_cards.append((ingredient, f"{amount:,.0f} mL", "Research grade"))
+                elif 'Oil' in ingredient:
+                    ingredient_cards.append((ingredient, f"{amount:,.0f} mL", "Cold-pressed"))
+                else:
+                    ingredient_cards.append((ingredient, f"{amount:,.0f} g", "Organic certified"))
+            st.markdown(_spec_grid(ingredient_cards), unsafe_allow_html=True)
+        
+        with ingredient_tabs[1]:
+            st.markdown(_spec_grid(
+                (culture, amount, "Viable count" if 'CFU' in amount else "Support ingredient")
+                for culture, amount in probiotic_requirements.items()
+            ), unsafe_allow_html=True)
+        
+        with ingredient_tabs[2]:
+            st.markdown(_spec_grid(
+                (metric, value, "") for metric, value in _QC_METRICS.items()
+            ), unsafe_allow_html=True)
+    
+    # Production process visualization
+    if include_timeline:
+        st.markdown("### ⚙️ CapriX Research Production Timeline")
+        
+        df_process, process_df = _process_table()
+        
+        # Enhanced timeline chart
+        starts, ends = _process_schedule(tuple(df_process['duration']))
+        import plotly.express as px  # deferred until the timeline is actually shown
+        fig = px.timeline(
+            df_process,
+            x_start=starts,
+            x_end=ends,
+            y='step',
+            color='temp',
+            title=f"CapriX Research Production Timeline - {batch_size}L Batch (Total: {ends[-1]} minutes)",
+            color_continuous_scale='RdYlBu_r',
+            hover_data=['critical_params', 'equipment']
+        )
+        
+        fig.update_layout(height=600, xaxis_title="Time (minutes)")
+        st.plotly_chart(fig, use_container_width=True, key="caprix_gantt")
+        
+        # Process details table
+        st.markdown("#### 📋 Process Step Details")
+        st.dataframe(process_df, use_container_width=True)
+    
+    # Research cost analysis
+    if include_analysis:
+        st.markdown("### 💰 Research Economics & Cost Analysis")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.markdown("#### Research Cost Breakdown (per 100mL)")
+            
+            # Create research cost chart; only the title depends on the selected application
+            fig_cost = _cost_pie(_COST_COMPONENTS['Cost ($)'], _COST_COMPONENTS['Component'])
+            fig_cost.update_layout(title=f"CapriX Research Cost Structure - {research_type}")
+            st.plotly_chart(fig_cost, use_container_width=True, key="cost_pie")
+        
+        with col2:
+            st.markdown("#### Research Scaling Analysis")
+            
+            # Research scaling economics (constant data, built once per process)
+            st.plotly_chart(_scaling_fig(), use_container_width=True, key="scale_dual")
+        
+        # Research metrics
+        st.markdown("#### 📈 Research Project Metrics")
+        
+        research_cost = sum(_COST_COMPONENTS['Cost ($)']) * batch_size * 10
+        samples_produced = batch_size * 10  # 100mL samples
+        analysis_time = _process_table()[0]['duration'].sum() / 60
+        quality_tests = 12  # Number of quality tests
+        st.markdown(_spec_grid([
+            ("Research Budget", f"${research_cost:,.2f}", f"For {batch_size}L study"),
+            ("Research Samples", f"{samples_produced}", "For analysis"),
+            ("Production Time", f"{analysis_time:.1f} hours", f"Per {batch_size}L batch"),
+            ("Quality Tests", f"{quality_tests}", "Per batch")
+        ]), unsafe_allow_html=True)
+
+def _academic_info_inputs() -> Tuple[str, str, str]:
+    """Researcher details for the report, returned as (researcher, supervisor, institution)"""
+    st.markdown("#### 🎓 Academic Information")
+    col_x, col_y = st.columns(2)
+    with col_x:
+        researcher = st.text_input("Researcher Name", placeholder="Chiali Z.", key="report_researcher")
+        supervisor = st.text_input("Supervisor", placeholder="Dr. Mohamed Merzoug", key="report_supervisor")
+    with col_y:
+        institution = st.text_input("Institution", 
+                                    placeholder="Higher School of Biological Sciences of Oran",
+                                    value="Higher School of Biological Sciences of Oran",
+                                    key="report_institution")
+        st.selectbox("Study Purpose", 
+                     ["Academic Research", "Thesis Project", "Clinical Study", "Course Project"],
+                     key="report_study_purpose")
+    return researcher, supervisor, institution
+
+def _render_preview(rec: Dict, report_sections: Dict):
+    """Report preview metrics for the export page"""
+    st.markdown("### 📊 Report Preview")
+    
+    # Live preview metrics
+    if rec['is_caprix']:
+        st.markdown("""
+        <div class="metric-container">
+            <div style="font-size: 1.2rem; font-weight: bold; color: #b8860b;">⭐ CapriX Research</div>
+            <div style="font-size: 0.9rem; margin-top: 0.5rem;">Experimental Formula</div>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    confidence = rec.get('confidence_score', 85)
+    st.metric("Analysis Confidence", f"{confidence}%", 
+             delta="Research grade" if confidence > 80 else "Requires validation")
+    
+    # Page count estimation
+    selected_sections = sum(report_sections.values())
+    estimated_pages = max(6, selected_sections * 2 + (2 if rec['is_caprix'] else 0))
+    st.metric("Estimated Pages", estimated_pages, f"{selected_sections} sections")
+    
+    # Generation time estimate
+    est_time = max(20, rec['complexity_score'] * 8)
+    st.metric("Generation Time", f"~{est_time}s", "Academic detail")
+
+@st.fragment
+def _export_workspace(rec: Dict, user_data: Dict):
+    """Export page controls; the inputs and everything that reads them rerun together"""
+    # Enhanced export interface
+    col1, col2 = st.columns([2, 1])
+    
+    with col1:
+        st.markdown("### 📋 Academic Report Generation")
+        
+        # Report customization options
+        report_sections = {
+            'Executive Summary': st.checkbox("Executive Summary", value=True, help="High-level recommendation overview"),
+            'Patient Assessment': st.checkbox("Patient Assessment", value=True, help="Detailed patient information and history"),
+            'Formula Specification': st.checkbox("Formula Specification", value=True, help="Complete nutritional composition"),
+            'Clinical Evidence': st.checkbox("Clinical Evidence", value=True, help="Supporting research and studies"),
+            'Safety Assessment': st.checkbox("Safety Assessment", value=True, help="Risk analysis and precautions"),
+            'Feeding Guidelines': st.checkbox("Feeding Guidelines", value=True, help="Detailed feeding instructions"),
+            'Research Notes': st.checkbox("Research Notes", value=False, help="Academic research considerations"),
+            'References': st.checkbox("Scientific References", value=True, help="Complete bibliography")
+        }
+        
+        # Report format and delivery options
+        col_a, col_b = st.columns(2)
+        with col_a:
+            report_format = st.selectbox(
+                "Report Format",
+                ["📄 Academic PDF", "📊 Research Excel", "📝 Clinical Document", 
+                 "🌐 HTML Report", "📋 Summary Report"]
+            )
+            
+            confidentiality = st.selectbox(
+                "Confidentiality Level",
+                ["Academic Use", "Research Data", "Clinical Study", "Confidential"]
+            )
+        
+        with col_b:
+            language = st.selectbox(
+                "Report Language",
+                ["English", "French", "Arabic", "Spanish"]
+            )
+            
+            template_style = st.selectbox(
+                "Template Style",
+                ["Academic Research", "Clinical Study", "Student Report", "Professional"]
+            )
+        
+        # Academic information
+        researcher_name, supervisor_name, institution = _academic_info_inputs()
+    
+    with col2:
+        _render_preview(rec, report_sections)
+    
+    # Report generation
+    st.markdown("### 🚀 Generate Academic Report")
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        if st.button("📄 Generate Academic Report", type="primary", use_container_width=True):
+            # One timestamp for the report header, footer and file name
+            generated_at = datetime.datetime.now()
+            # Status labels follow the real generation stages instead of a timed progress bar
+            with st.status("🔄 Generating comprehensive academic report...", expanded=False) as status:
+                report_bytes = generate_academic_report(
+                    rec, report_sections, user_data,
+                    researcher_name, supervisor_name, institution,
+                    progress=lambda label: status.update(label=label),
+                    now=generated_at
+                )
+                status.update(label="✅ Academic report generated successfully!", state="complete")
+            
+            # Keep the report for later reruns, tied to the recommendation it describes
+            st.session_state.academic_report = (
+                st.session_state.get('rec_version', 0),
+                f"CapriX_Academic_Report_{generated_at.strftime('%Y%m%d_%H%M')}.md",
+                report_bytes,
+            )
+            
+            # Full reports run to several KB; keep them collapsed so the markdown renders on demand
+            with st.expander("📄 Generated Report", expanded=False):
+                st.markdown(report_bytes.decode("utf-8"))
+        
+        # Download button, kept across reruns until the recommendation changes
+        report_version, report_file_name, report_bytes = st.session_state.get('academic_report', (None, None, None))
+        if report_version == st.session_state.get('rec_version', 0):
+            st.download_button(
+                label="📥 Download Academic Report",
+                data=report_bytes,
+                file_name=report_file_name,
+                mime="text/markdown",
+                use_container_width=True
+            )
+    
+    with col2:
+        if st.button("📧 Share with Supervisor", use_container_width=True):
+            email_recipient = st.text_input("Supervisor Email", 
+                                          placeholder="merzoug.mohamed1@yahoo.fr",
+                                          value="merzoug.mohamed1@yahoo.fr")
+            if email_recipient:
+                st.success(f"📧 Report prepared for sharing with {email_recipient}")
+                st.info("Note: Please send manually via email")
+    
+    with col3:
+        if st.button("💾 Save to Research Database", use_container_width=True):
+            st.success("💾 Report saved to research database")
+            st.info("Note: Local storage for academic use")
+    
+    # Quick export options
+    st.markdown("### ⚡ Quick Export Options")
+    
+    payloads = _quick_export_payloads(rec, user_data, researcher_name)
+    
+    # Probiotic and safety exports are None when the recommendation has nothing to list
+    for col, (key, label, file_name) in zip(st.columns(len(_QUICK_EXPORTS)), _QUICK_EXPORTS):
+        data = payloads[key]
+        if data is not None:
+            with col:
+                st.download_button(
+                    label,
+                    data=data,
+                    file_name=file_name,
+                    mime="text/plain",
+                    use_container_width=True
+                )
+
+# Static page markup, bound once and referenced by the page code below
+_SIDEBAR_BRAND_HTML = """
+<div style="text-align: center; padding: 1.5rem; background: linear-gradient(135deg, #1e3a8a 0%, #3b82f6 100%); border-radius: 16px; margin-bottom: 1.5rem; color: white;">
+    <h2 style="margin: 0; font-size: 1.8rem;">🍼 CapriX Formula Designer</h2>
+    <p style="margin: 0.5rem 0 0 0; font-size: 0.9rem; opacity: 0.9;">Research & Development Platform</p>
+    <p style="margin: 0; font-size: 0.7rem; opacity: 0.7;">v2.0 - Enhanced Streamlit Edition</p>
+</div>
+"""
+
+_SIDEBAR_DISCLAIMER_HTML = """
+<div style="background: #fef2f2; border: 2px solid #ef4444; border-radius: 8px; padding: 1rem; font-size: 0.8rem;">
+    <strong>⚠️ ACADEMIC PROJECT</strong><br>
+    This is a research and educational tool. 
+    All recommendations require medical supervision.
+</div>
+"""
+
+_MAIN_HEADER_HTML = """
+<div style="text-align: center; margin-bottom: 2rem;">
+    <h1 class="main-header">🍼 Infant Formula Designer</h1>
+    <div style="background: linear-gradient(135deg, #f8fafc 0%, #e2e8f0 100%); border-radius: 16px; padding: 1.5rem; margin: 1rem 0; border: 2px solid #cbd5e1;">
+        <p style="font-size: 1.2rem; color: #475569; margin: 0; font-weight: 500;">
+            <strong>Evidence-Based Customized Infant Formula Recommendations</strong><br>
+            <em style="font-size: 1rem; color: #64748b;">Academic Research Project • WHO/AAP/ESPGHAN/Codex Compliant • Enhanced with CapriX Technology</em>
+        </p>
+    </div>
+</div>
+"""
+
+_CAPRIX_BANNER_HTML = """
+<div class="caprix-exclusive">
+    <h3>🌟 CapriX Exclusive Formula Selected</h3>
+    <p style="font-size: 1.1rem; margin: 0.5rem 0;">
+        <strong>Advanced Probiotic Goat Milk Technology</strong><br>
+        Research-validated dual-strain fermentation system
+    </p>
+</div>
+"""
+
+_SPEC_CARD_TMPL = """
+<div class="metric-container">
+    <div style="font-size: 0.9rem; color: #64748b; margin: 0.25rem 0;">{label}</div>
+    <div style="font-size: 1.1rem; font-weight: 600; color: #1f2937;">{value}</div>
+    <div style="font-size: 0.8rem; color: #16a34a;">{note}</div>
+</div>
+"""
+
+_METRIC_CARD_TMPL = """
+<div class="metric-container">
+    <div style="font-size: 1.5rem;">{emoji}</div>
+    <div style="font-size: 0.9rem; color: #64748b; margin: 0.25rem 0;">{label}</div>
+    <div style="font-size: 1.1rem; font-weight: 600; color: #1f2937;">{value}</div>
+</div>
+"""
+
+# About & Contact page copy
+_ABOUT_MISSION_MD = """
+### 🍼 About CapriX Infant Formula Designer
+
+**CapriX** is an innovative startup initiative focused on the design and development of 
+specialized infant milk formulas, primarily based on goat milk. The project also explores 
+alternative milk sources, including plant-based ingredients, to address specific nutritional 
+and medical needs in infants.
+
+#### 🎯 Mission Statement
+To develop evidence-based, specialized infant nutrition solutions using advanced biotechnology 
+and molecular biology approaches, with a focus on goat milk-based formulations for academic 
+research and educational purposes.
+
+#### 🏫 Academic Foundation
+This project is developed at the **Higher School of Biological Sciences of Oran** (École Supérieure 
+en Sciences Biologiques d'Oran), Algeria, integrating cutting-edge research in:
+- **Biotechnology** and **Molecular Biology**
+- **Microbiology** and **Nutrition Science**
+- **Infant Formula Development** and **Food Safety**
+- **Probiotic Research** and **Functional Foods**
+
+#### 🔬 Research Focus Areas
+- Goat milk-based infant formulations with enhanced digestibility
+- Probiotic and prebiotic integration for gut health
+- Alternative protein sources for specialized nutritional needs
+- Nutritional optimization for medical conditions
+- Academic research in infant nutrition science
+"""
+
+_ABOUT_STATS_CARD_HTML = """
+<div class="medical-card">
+    <h4>📊 Project Overview</h4>
+    <ul style="list-style: none; padding: 0;">
+        <li>🦠 <strong>8+</strong> Probiotic strains studied</li>
+        <li>🏥 <strong>6</strong> Medical conditions addressed</li>
+        <li>🧪 <strong>4</strong> Formula base types</li>
+        <li>📚 <strong>40+</strong> Scientific references</li>
+        <li>🌍 <strong>Multi-country</strong> research evidence</li>
+        <li>🎓 <strong>Academic</strong> research project</li>
+        <li>🔬 <strong>Research-grade</strong> formulations</li>
+        <li>📖 <strong>Educational</strong> purpose</li>
+    </ul>
+</div>
+"""
+
+_ABOUT_INNOVATION_HTML = """
+<div class="caprix-exclusive" style="margin-top: 1rem; padding: 1rem;">
+    <h4>🌟 CapriX Innovation</h4>
+    <p style="margin: 0; font-size: 0.9rem;">
+        Pioneering goat milk formula technology for academic research 
+        and specialized infant nutrition studies
+    </p>
+</div>
+"""
+
+_TEAM_LEADERSHIP_MD = """
+#### 🎓 Project Leadership
+**Chiali Z.**  
+Final-Year Student, Molecular Biology
+
+📧 **Team Contact:**  
+caprix.startup@gmail.com
+
+🏫 **Institution:**  
+Higher School of Biological Sciences of Oran  
+(École Supérieure en Sciences Biologiques d'Oran)  
+Algeria
+
+🔬 **Specialization:**  
+• Infant Formula Development  
+• Goat Milk Technology  
+• Probiotic Research  
+• Molecular Biology Applications
+"""
+
+_TEAM_SUPERVISION_MD = """
+#### 👨‍🏫 Academic Supervision
+**Dr. Mohamed Merzoug**  
+Lecturer & App Development Supervisor
+
+📧 **Contact:**  
+merzoug.mohamed1@yahoo.fr
+
+**Dr. H. Bouderbala**  
+Lecturer & Project Supervisor
+
+🎯 **Combined Expertise:**  
+• Biotechnology & Molecular Biology  
+• Microbiology & Physiology  
+• Nutrition Science & Food Technology  
+• Research Methodology & Academic Supervision
+"""
+
+_TEAM_GUIDELINES_MD = """
+#### 📚 Academic Guidelines & Support
+
+⚠️ **Important Notice:**  
+This is a research and educational tool  
+developed for academic purposes
+
+🏥 **Medical Consultation:**  
+Always consult qualified pediatricians  
+or infant nutrition specialists
+
+🔬 **Research Applications:**  
+• Academic research projects  
+• Educational demonstrations  
+• Student learning exercises  
+• Scientific methodology studies
+
+📖 **Intended Use:**  
+Academic research and educational  
+purposes only - not for clinical use
+"""
+
+_TECHNICAL_DETAILS_MD = """
+#### 📱 Application Technical Details
+- **Version:** 2.0 - Enhanced Streamlit Edition
+- **Build Date:** December 31, 2024
+- **Platform:** Web-based Streamlit Application
+- **Technology Stack:** Python, Streamlit, Plotly, Pandas
+- **Database:** Enhanced medical evidence database
+- **Security:** Academic-grade data protection
+- **Compatibility:** Modern web browsers
+- **Performance:** Optimized for research use
+
+#### 🔄 Recent Updates & Features
+- Enhanced CapriX formula integration
+- Improved academic interface design
+- Advanced visualization capabilities
+- Expanded evidence database
+- Research-focused cost analysis tools
+- Academic export and reporting features
+"""
+
+_COMPLIANCE_MD = """
+#### 📜 Academic Compliance & Standards
+- ✅ **WHO Guidelines** Referenced
+- ✅ **Codex Alimentarius** Standards Reviewed
+- ✅ **Academic Standards** Maintained
+- ✅ **Research Ethics** Considered
+- ✅ **Educational Purpose** Clearly Defined
+- ✅ **Scientific Methodology** Applied
+
+#### 🎓 Educational Resources & Training
+- Academic research methodology guidance
+- Scientific reference integration
+- Student-friendly interface design
+- Educational content and explanations
+- Research data export capabilities
+- Academic documentation standards
+
+#### 📊 Research Applications
+- Thesis and dissertation projects
+- Academic course assignments
+- Research methodology studies
+- Nutritional science education
+"""
+
+_ACADEMIC_DISCLAIMER_HTML = """
+<div class="medical-warning">
+    <h4>🎓 Academic Research Project Notice</h4>
+    <p><strong>This application is developed as part of an academic research project at the Higher School of Biological Sciences of Oran, Algeria.</strong></p>
+
+    <h5>📚 Educational Purpose & Scope:</h5>
+    <ul>
+        <li><strong>Academic Research Tool:</strong> This application is designed exclusively for research and educational purposes</li>
+        <li><strong>Student Learning:</strong> Intended to support learning in molecular biology, nutrition science, and biotechnology</li>
+        <li><strong>Research Methodology:</strong> Demonstrates evidence-based approach to infant formula development</li>
+        <li><strong>Scientific Literature Review:</strong> Integrates current research findings and academic standards</li>
+    </ul>
+
+    <h5>⚠️ Important Limitations & Requirements:</h5>
+    <ul>
+        <li><strong>Not for Clinical Use:</strong> This is NOT a medical device or clinical decision-support tool</li>
+        <li><strong>Medical Supervision Required:</strong> All formula recommendations must be reviewed by qualified pediatricians</li>
+        <li><strong>Research Data Only:</strong> Formulations are based on literature review and require clinical validation</li>
+        <li><strong>No Medical Advice:</strong> This application does not provide medical advice or replace professional consultation</li>
+        <li><strong>Experimental Status:</strong> CapriX formulations are experimental and for research purposes only</li>
+    </ul>
+
+    <h5>🏥 Medical Emergency Guidance:</h5>
+    <p><strong>For Medical Emergencies:</strong> Contact your local pediatrician, healthcare provider, or emergency medical services immediately. This application is not intended for emergency medical situations.</p>
+
+    <h5>📞 Academic Support:</h5>
+    <p><strong>For Academic Questions:</strong> Contact the CapriX team at caprix.startup@gmail.com or the supervising faculty at merzoug.mohamed1@yahoo.fr</p>
+</div>
+"""
+
+# Enhanced Sidebar with CapriX Team Information
+with st.sidebar:
+    # CapriX Team branding
+    st.markdown(_SIDEBAR_BRAND_HTML, unsafe_allow_html=True)
+    
+    # Navigation
+    st.markdown("### 📋 Navigation Menu")
+    page = st.radio(
+        "Select Page:",
+        ["🏠 Formula Designer", "📊 Evidence Database", "⭐ CapriX Exclusive", 
+         "📤 Export & Reports", "ℹ️ About & Contact"],
+        index=0,
+        label_visibility="collapsed"
+    )
+    
+    # Application Statistics
+    st.markdown("### 📈 System Status")
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("Active Probiotics", "8", "2 exclusive")
+        st.metric("Conditions", "6", "Evidence-based")
+    with col2:
+        st.metric("Formulas", "4", "1 exclusive")
+        st.metric("Studies", "40+", "Clinical refs")
+    
+    # Quick Actions
+    st.markdown("### ⚡ Quick Actions")
+    if st.button("🔄 Reset Session", use_container_width=True):
+        st.session_state.clear()
+        safe_rerun()
+    
+    if st.button("📚 Academic Resources", use_container_width=True):
+        st.info("""
+        📖 **Academic Resources:**
+        • Infant Nutrition Guidelines (WHO/UNICEF)
+        • Pediatric Gastroenterology References
+        • Food Safety Standards
+        • Research Methodology in Nutrition Science
+        
+        📧 **Academic Contact:** caprix.startup@gmail.com
+        """)
+    
+    # CapriX Team Contact Information
+    st.markdown("---")
+    st.markdown("### 📞 CapriX Team Contact")
+    st.markdown("""
+    **CapriX Startup Initiative**  
+    Higher School of Biological Sciences of Oran  
+    (École Supérieure en Sciences Biologiques d'Oran, Algeria)
+
+    **Founder & Developer:**  
+    Chiali Z. - Final Year Student, Molecular Biology  
+
+    **Academic Supervisors:**  
+    • Dr. Mohamed Merzoug - Lecturer  
+    • Dr. H. Bouderbala - Lecturer  
+
+    **Expertise Areas:**  
+    • Biotechnology • Molecular Biology  
+    • Microbiology • Physiology • Nutrition  
+
+    **Contact:**  
+    📧 CapriX Team: caprix.startup@gmail.com  
+    📧 App Development: merzoug.mohamed1@yahoo.fr  
+
+    **Version:** 2.0 - Enhanced Streamlit Edition
+    """)
+    
+    # Academic Disclaimer
+    st.markdown("---")
+    st.markdown(_SIDEBAR_DISCLAIMER_HTML, unsafe_allow_html=True)
+
+# Main Application Header
+st.markdown(_MAIN_HEADER_HTML, unsafe_allow_html=True)
+
+# Page Navigation and Content
+if page == "🏠 Formula Designer":
+    st.markdown('<h2 class="sub-header">👶 Advanced Formula Design & Medical Assessment</h2>', unsafe_allow_html=True)
+    
+    # Enhanced assessment form
+    with st.form("comprehensive_assessment", clear_on_submit=False):
+        st.markdown("### 📋 Comprehensive Patient Assessment")
+        
+        # Patient Demographics
+        st.markdown("#### 👶 Patient Demographics")
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            age = st.number_input(
+                "Age (months)", 
+                min_value=0.0, max_value=36.0, value=6.0, step=0.1,
                 help="Current age in months (0-36)"
             )
         with col2:
@@ -1236,199 +2820,28 @@ if page == "🏠 Formula Designer":
             )
     
     # Process form submission
-    if submitted:
-        # Store comprehensive user data
-        st.session_state.user_data = {
-            'age': age, 'weight': weight, 'birth_weight': birth_weight,
-            'primary_diagnosis': primary_diagnosis, 'secondary_conditions': secondary_conditions,
-            'allergies': allergies, 'cmpa_severity': cmpa_severity,
-            'prefer_caprix': prefer_caprix, 'feeding_history': feeding_history,
-            'family_history': family_history, 'clinical_notes': clinical_notes,
-            'probiotic_strategy': probiotic_strategy, 'special_requirements': special_requirements
-        }
-        
-        # Generate recommendation
-        with st.spinner("🧬 Performing advanced formula analysis..."):
-            time.sleep(1)  # Simulate processing
-            recommendation = engine.recommend_formula(**st.session_state.user_data)
-            st.session_state.current_recommendation = recommendation
-        
-        st.success("🎉 Personalized formula recommendation generated successfully!")
-        st.balloons()
-    
-    # Display Results
-    if st.session_state.current_recommendation:
-        rec = st.session_state.current_recommendation
-        
-        st.markdown("---")
-        st.markdown('<h2 class="sub-header">📋 Personalized Formula Recommendation</h2>', unsafe_allow_html=True)
-        
-        # Confidence and overview
-        col1, col2, col3 = st.columns([2, 1, 1])
-        
-        with col1:
-            if rec['is_caprix']:
-                st.markdown("""
-                <div class="caprix-exclusive">
-                    <h3>🌟 CapriX Exclusive Formula Selected</h3>
-                    <p style="font-size: 1.1rem; margin: 0.5rem 0;">
-                        <strong>Advanced Probiotic Goat Milk Technology</strong><br>
-                        Research-validated dual-strain fermentation system
-                    </p>
-                </div>
-                """, unsafe_allow_html=True)
-            else:
-                st.markdown(f"### {rec['formula_base']['name']}")
-                st.write(rec['formula_base']['description'])
-        
-        with col2:
-            confidence = rec.get('confidence_score', 85)
-            if confidence >= 90:
-                st.metric("Confidence", f"{confidence}%", "Excellent")
-            elif confidence >= 80:
-                st.metric("Confidence", f"{confidence}%", "High")
-            else:
-                st.metric("Confidence", f"{confidence}%", "Moderate")
-        
-        with col3:
-            category = rec['formula_base'].get('category', 'Standard')
-            st.metric("Category", category)
-            if rec['is_caprix']:
-                st.metric("Status", "Research", "Exclusive")
-            else:
-                st.metric("Status", "Standard", "Medical")
-        
-        # Detailed composition analysis
-        st.markdown("### 🧪 Nutritional Composition Analysis")
-        
-        # Interactive composition visualization
-        col1, col2 = st.columns([2, 1])
-        
-        with col1:
-            # Create enhanced composition chart
-            composition = rec['composition']
-            
-            # Macronutrient pie chart
-            fig_macro = go.Figure(data=[go.Pie(
-                labels=['Protein', 'Fat', 'Carbohydrates'],
-                values=[
-                    composition['protein']['amount'],
-                    composition['fat']['amount'], 
-                    composition['carbs']['amount']
-                ],
-                hole=0.4,
-                marker_colors=['#3b82f6', '#10b981', '#f59e0b']
-            )])
-            
-            fig_macro.update_layout(
-                title="Macronutrient Distribution (g/100ml)",
-                height=400,
-                showlegend=True,
-                annotations=[dict(text=f"{composition['energy']['amount']}<br>kcal/100ml", 
-                                x=0.5, y=0.5, font_size=16, showarrow=False)]
-            )
-            
-            st.plotly_chart(fig_macro, use_container_width=True)
-        
-        with col2:
-            st.markdown("#### 📊 Nutritional Metrics")
-            
-            # Enhanced metrics display
-            metrics_data = [
-                ("Energy", f"{composition['energy']['amount']} kcal/100ml", "🔥"),
-                ("Protein", f"{composition['protein']['amount']} g/100ml", "💪"),
-                ("Fat", f"{composition['fat']['amount']} g/100ml", "🥑"),
-                ("Carbs", f"{composition['carbs']['amount']} g/100ml", "🌾")
-            ]
-            
-            for label, value, emoji in metrics_data:
-                st.markdown(f"""
-                <div class="metric-container">
-                    <div style="font-size: 1.5rem;">{emoji}</div>
-                    <div style="font-size: 0.9rem; color: #64748b; margin: 0.25rem 0;">{label}</div>
-                    <div style="font-size: 1.1rem; font-weight: 600; color: #1f2937;">{value}</div>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            # Compliance check
-            if rec.get('compliance_check', {}).get('codex_compliant', True):
-                st.markdown("""
-                <div class="medical-success">
-                    ✅ <strong>Codex Alimentarius Compliant</strong><br>
-                    Meets international infant formula standards
-                </div>
-                """, unsafe_allow_html=True)
-        
-        # Feeding guidelines
-        st.markdown("### 📅 Personalized Feeding Guidelines")
-        
-        col1, col2, col3, col4 = st.columns(4)
-        
-        feeding = rec['feeding_guide']
-        with col1:
-            st.metric("Daily Energy", f"{feeding['daily_energy_needs']} kcal", 
-                     help="Total daily energy requirements based on age and weight")
-        with col2:
-            st.metric("Daily Volume", f"{feeding['daily_volume']} ml",
-                     help="Total daily formula volume needed")
-        with col3:
-            st.metric("Feeds/Day", feeding['feeds_per_day'],
-                     help="Recommended number of feeding sessions")
-        with col4:
-            st.metric("Per Feed", f"{feeding['volume_per_feed']} ml",
-                     help="Volume per individual feeding session")
-        
-        # Enhanced probiotic information
-        if rec['probiotics']:
-            st.markdown("### 🦠 Probiotic Profile & Clinical Evidence")
-            
-            for i, prob in enumerate(rec['probiotics']):
-                with st.expander(f"🔬 {prob['name']}" + (" ⭐ Exclusive" if prob.get('caprix_exclusive') else "")):
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        st.markdown(f"**Dosage:** {prob['dosage']}")
-                        st.markdown(f"**Mechanism:** {prob.get('mechanism', 'Not specified')}")
-                        
-                        # Evidence level badge
-                        evidence_level = prob['evidence_level']
-                        if evidence_level == 'High':
-                            st.markdown('<span class="badge badge-high">High Evidence</span>', unsafe_allow_html=True)
-                        elif evidence_level == 'Moderate':
-                            st.markdown('<span class="badge badge-moderate">Moderate Evidence</span>', unsafe_allow_html=True)
-                        else:
-                            st.markdown('<span class="badge badge-low">Limited Evidence</span>', unsafe_allow_html=True)
-                    
-                    with col2:
-                        st.markdown(f"**Clinical Benefits:** {prob['benefits']}")
-                        st.markdown(f"**Safety Profile:** {prob.get('safety_profile', 'Standard')}")
-                        
-                        if prob.get('url'):
-                            st.markdown(f"[📖 View Research]({prob['url']})")
+    if submitted:
+        # Store comprehensive user data
+        st.session_state.user_data = {
+            'age': age, 'weight': weight, 'birth_weight': birth_weight,
+            'primary_diagnosis': sys.intern(primary_diagnosis), 'secondary_conditions': secondary_conditions,
+            'allergies': allergies, 'cmpa_severity': cmpa_severity,
+            'prefer_caprix': prefer_caprix, 'feeding_history': feeding_history,
+            'family_history': family_history, 'clinical_notes': clinical_notes,
+            'probiotic_strategy': probiotic_strategy, 'special_requirements': special_requirements
+        }
         
-        # Safety assessment
-        if rec.get('safety_assessment'):
-            st.markdown("### ⚠️ Safety Assessment & Precautions")
-            
-            safety_items = rec['safety_assessment']
-            if isinstance(safety_items, list):
-                for item in safety_items:
-                    if 'MEDICAL SUPERVISION' in item or 'SEVERE' in item:
-                        st.markdown(f"""
-                        <div class="medical-warning">
-                            🚨 <strong>Critical Warning:</strong> {item}
-                        </div>
-                        """, unsafe_allow_html=True)
-                    elif 'Research Formula' in item:
-                        st.markdown(f"""
-                        <div class="medical-warning">
-                            🔬 <strong>Research Notice:</strong> {item}
-                        </div>
-                        """, unsafe_allow_html=True)
-                    elif 'Caution' in item or 'Monitor' in item:
-                        st.warning(f"⚠️ {item}")
-                    else:
-                        st.info(f"ℹ️ {item}")
+        # Generate recommendation
+        with st.spinner("🧬 Performing advanced formula analysis..."):
+            recommendation = _cached_recommend(_freeze_params(st.session_state.user_data))
+            st.session_state.current_recommendation = recommendation
+            st.session_state.rec_version = st.session_state.get('rec_version', 0) + 1
+        
+        st.success("🎉 Personalized formula recommendation generated successfully!")
+    
+    # Display Results
+    if st.session_state.current_recommendation:
+        _render_recommendation(st.session_state.current_recommendation)
 
 elif page == "📊 Evidence Database":
     st.markdown('<h2 class="sub-header">📚 Scientific Evidence Database</h2>', unsafe_allow_html=True)
@@ -1450,79 +2863,25 @@ elif page == "📊 Evidence Database":
         st.markdown("### Advanced Probiotic Strain Database")
         
         # Create searchable probiotic database
-        probiotic_data = []
-        for name, data in probiotic_db.probiotics.items():
-            # Apply search filter
-            if search_query and search_query.lower() not in name.lower() and search_query.lower() not in ', '.join(data['indications']).lower():
-                continue
-            
-            # Apply evidence filter
-            if evidence_filter != "All" and data['evidence_level'] != evidence_filter:
-                continue
-                
-            # Apply category filter
-            if category_filter == "CapriX Exclusive" and not data.get('caprix_exclusive', False):
-                continue
-            
-            probiotic_data.append({
-                'Strain': name + (" ⭐" if data.get('caprix_exclusive') else ""),
-                'Primary Indications': ', '.join(data['indications'][:3]),
-                'Dosage': data['dosage'],
-                'Evidence Level': data['evidence_level'],
-                'Clinical Benefits': data['benefits'][:80] + "..." if len(data['benefits']) > 80 else data['benefits'],
-                'Safety Profile': data.get('safety_profile', 'Standard')[:50] + "..." if len(data.get('safety_profile', 'Standard')) > 50 else data.get('safety_profile', 'Standard')
-            })
-        
-        if probiotic_data:
+        df_probiotics = _filter_probiotics(search_query, evidence_filter, category_filter, probiotic_db.version)
+        
+        if not df_probiotics.empty:
             # Display enhanced dataframe
-            df_probiotics = pd.DataFrame(probiotic_data)
-            
-            # Color coding function
-            def color_evidence(val):
-                if 'High' in val:
-                    return 'background-color: #dcfce7'
-                elif 'Moderate' in val:
-                    return 'background-color: #fef3c7'
-                else:
-                    return 'background-color: #fee2e2'
-            
-            styled_df = df_probiotics.style.applymap(color_evidence, subset=['Evidence Level'])
-            st.dataframe(styled_df, use_container_width=True, height=400)
-            
-            # Detailed strain analysis
-            st.markdown("#### 🔬 Detailed Strain Analysis")
-            selected_strain = st.selectbox(
-                "Select strain for detailed analysis:",
-                ["None"] + [item['Strain'].replace(" ⭐", "") for item in probiotic_data]
-            )
+
+            if len(df_probiotics) > 100:
+                # Styler output is generated cell by cell in Python; large tables skip it
+                st.dataframe(
+                    df_probiotics,
+                    column_config={'Evidence Level': st.column_config.TextColumn(
+                        "Evidence Level", help="Strength of clinical evidence: High, Moderate or Low"
+                    )},
+                    use_container_width=True, height=400
+                )
+            else:
+                styled_df = df_probiotics.style.apply(_evidence_css, subset=['Evidence Level'])
+                st.dataframe(styled_df, use_container_width=True, height=400)
             
-            if selected_strain != "None":
-                strain_data = probiotic_db.probiotics[selected_strain]
-                
-                # Create detailed view
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    st.markdown(f"#### {selected_strain}")
-                    if strain_data.get('caprix_exclusive'):
-                        st.markdown('<span class="badge badge-exclusive">CapriX Exclusive</span>', unsafe_allow_html=True)
-                    
-                    evidence_class = f"evidence-{strain_data['evidence_level'].lower()}"
-                    st.markdown(f'<div class="{evidence_class}">', unsafe_allow_html=True)
-                    st.markdown(f"**Evidence Level:** {strain_data['evidence_level']}")
-                    st.markdown(f"**Primary Indications:** {', '.join(strain_data['indications'])}")
-                    st.markdown(f"**Clinical Benefits:** {strain_data['benefits']}")
-                    st.markdown('</div>', unsafe_allow_html=True)
-                
-                with col2:
-                    st.markdown("#### Technical Specifications")
-                    st.markdown(f"**Recommended Dosage:** {strain_data['dosage']}")
-                    st.markdown(f"**Mechanism of Action:** {strain_data.get('mechanism', 'Not specified')}")
-                    st.markdown(f"**Safety Profile:** {strain_data.get('safety_profile', 'Standard')}")
-                    
-                    if strain_data.get('url'):
-                        st.markdown(f"[📖 View Research Publication]({strain_data['url']})")
-                        st.markdown(f"**Reference:** {strain_data['references']}")
+            _strain_detail(df_probiotics['Strain'].str.replace(" ⭐", "", regex=False).tolist())
         else:
             st.info("No probiotics match your search criteria. Try adjusting your filters.")
     
@@ -1530,67 +2889,28 @@ elif page == "📊 Evidence Database":
         st.markdown("### Medical Conditions & Nutritional Requirements")
         
         # Enhanced conditions display
-        for condition_name, condition_data in condition_db.conditions.items():
-            with st.expander(f"🏥 {condition_name} - {condition_data['description'][:50]}..."):
+        for condition_name in condition_db.conditions:
+            title, left_md, right_md, nutrition_md, url_md = _render_condition_md(condition_name)
+            with st.expander(title):
                 col1, col2 = st.columns(2)
                 
                 with col1:
-                    st.markdown(f"**Full Description:** {condition_data['description']}")
-                    st.markdown(f"**Prevalence:** {condition_data['prevalence']}")
-                    st.markdown(f"**Severity Levels:** {', '.join(condition_data['severity_levels'])}")
+                    st.markdown(left_md)
                 
                 with col2:
-                    st.markdown("**Recommended Formula Strategies:**")
-                    for formula_type in condition_data['formula_recommendations']:
-                        st.markdown(f"• {formula_type}")
-                    
-                    st.markdown(f"**Probiotic Evidence:** {condition_data['probiotic_evidence']}")
+                    st.markdown(right_md)
                 
                 # Nutritional considerations
-                st.markdown("**Nutritional Considerations:**")
-                for nutrient, consideration in condition_data['nutritional_considerations'].items():
-                    st.markdown(f"• **{nutrient.title()}:** {consideration}")
+                st.markdown(nutrition_md)
                 
-                if condition_data.get('url'):
-                    st.markdown(f"[📖 Clinical Guidelines]({condition_data['url']})")
+                if url_md:
+                    st.markdown(url_md)
     
     with tab3:
         st.markdown("### Clinical Studies & Evidence Summary")
         
-        # Clinical evidence visualization
-        evidence_summary = {
-            'Condition': ['GERD', 'CMPA', 'Colic', 'NEC', 'Constipation'],
-            'High Evidence Studies': [12, 25, 18, 8, 10],
-            'Moderate Evidence Studies': [8, 15, 12, 5, 15],
-            'Total Participants': [2150, 4200, 3100, 800, 1950]
-        }
-        
-        # Create evidence chart
-        fig = go.Figure()
-        
-        fig.add_trace(go.Bar(
-            name='High Evidence',
-            x=evidence_summary['Condition'],
-            y=evidence_summary['High Evidence Studies'],
-            marker_color='#22c55e'
-        ))
-        
-        fig.add_trace(go.Bar(
-            name='Moderate Evidence',
-            x=evidence_summary['Condition'],
-            y=evidence_summary['Moderate Evidence Studies'],
-            marker_color='#f59e0b'
-        ))
-        
-        fig.update_layout(
-            title='Clinical Evidence by Condition',
-            xaxis_title='Medical Condition',
-            yaxis_title='Number of Studies',
-            barmode='stack',
-            height=400
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
+        # Clinical evidence visualization (constant data, built once per process)
+        st.plotly_chart(_build_evidence_fig(), use_container_width=True, key="evidence_bar")
         
         # Evidence quality metrics
         col1, col2, col3, col4 = st.columns(4)
@@ -1625,505 +2945,13 @@ elif page == "⭐ CapriX Exclusive":
     </div>
     """, unsafe_allow_html=True)
     
-    # Interactive formula calculator
-    st.markdown("### 🧮 CapriX Research Formula Calculator")
-    
-    # Calculator interface
-    col1, col2 = st.columns([1, 2])
-    
-    with col1:
-        st.markdown("#### Research Parameters")
-        batch_size = st.slider("Research Batch Size (Liters)", 1, 100, 10, step=1)
-        
-        research_type = st.selectbox(
-            "Research Application",
-            ["Laboratory Study", "Clinical Trial", "Pilot Research", "Academic Project"]
-        )
-        
-        quality_level = st.selectbox(
-            "Quality Standard",
-            ["Research Grade", "Clinical Grade", "Academic Standard", "Laboratory Standard"]
-        )
-        
-        include_analysis = st.checkbox("Include Cost Analysis", value=True)
-        include_timeline = st.checkbox("Show Production Timeline", value=True)
-    
-    with col2:
-        # Real-time calculation
-        st.markdown("#### Ingredient Requirements")
-        
-        # Base calculations
-        base_ingredients = {
-            'Fresh European Goat Milk': 850 * batch_size,
-            'Refined Olive Oil (Cold-Pressed)': 30 * batch_size,
-            'Sunflower Oil (High-Oleic)': 30 * batch_size,
-            'Date Sugar (Organic)': 30 * batch_size,
-            'Gum Arabic (Acacia Senegal)': 5 * batch_size,
-            'Carob Gum (Locust Bean)': 5 * batch_size
-        }
-        
-        # Probiotic calculations
-        probiotic_requirements = {
-            'L. rhamnosus CapriX-Enhanced': f"{1e9 * batch_size:.2e} CFU",
-            'S. thermophilus CapriX-T1': f"{1e9 * batch_size:.2e} CFU",
-            'Probiotic Stabilizer': f"{2 * batch_size} g",
-            'Cryoprotectant': f"{1.5 * batch_size} g"
-        }
-        
-        # Display ingredients
-        ingredient_tabs = st.tabs(["Base Ingredients", "Probiotic Cultures", "Quality Control"])
-        
-        with ingredient_tabs[0]:
-            for ingredient, amount in base_ingredients.items():
-                if 'Milk' in ingredient:
-                    st.metric(ingredient, f"{amount:,.0f} mL", f"Research grade")
-                elif 'Oil' in ingredient:
-                    st.metric(ingredient, f"{amount:,.0f} mL", f"Cold-pressed")
-                else:
-                    st.metric(ingredient, f"{amount:,.0f} g", f"Organic certified")
-        
-        with ingredient_tabs[1]:
-            for culture, amount in probiotic_requirements.items():
-                if 'CFU' in amount:
-                    st.metric(culture, amount, "Viable count")
-                else:
-                    st.metric(culture, amount, "Support ingredient")
-        
-        with ingredient_tabs[2]:
-            qc_metrics = {
-                'pH Target': '6.2 - 6.8',
-                'Viscosity': '120-180 mPa·s',
-                'Final Viability': '≥1×10⁶ CFU/mL',
-                'Research Shelf Life': '6 months (frozen)'
-            }
-            for metric, value in qc_metrics.items():
-                st.metric(metric, value)
-    
-    # Production process visualization
-    if include_timeline:
-        st.markdown("### ⚙️ CapriX Research Production Timeline")
-        
-        # Enhanced process steps
-        process_steps = [
-            {
-                'step': 'Raw Material QC',
-                'duration': 60,
-                'temp': 4,
-                'critical_params': 'Microbial count, protein content, fat composition',
-                'equipment': 'Laboratory testing suite'
-            },
-            {
-                'step': 'Pasteurization',
-                'duration': 25,
-                'temp': 85,
-                'critical_params': 'Time-temperature profile, pathogen elimination',
-                'equipment': 'Research-grade pasteurizer'
-            },
-            {
-                'step': 'Controlled Cooling',
-                'duration': 20,
-                'temp': 40,
-                'critical_params': 'Cooling rate, temperature uniformity',
-                'equipment': 'Precision heat exchanger'
-            },
-            {
-                'step': 'Oil Phase Preparation',
-                'duration': 30,
-                'temp': 40,
-                'critical_params': 'Oil ratio precision, antioxidant addition',
-                'equipment': 'High-speed laboratory mixer'
-            },
-            {
-                'step': 'Emulsification',
-                'duration': 25,
-                'temp': 40,
-                'critical_params': 'Particle size distribution, stability',
-                'equipment': 'Laboratory homogenizer'
-            },
-            {
-                'step': 'Hydrocolloid Integration',
-                'duration': 20,
-                'temp': 40,
-                'critical_params': 'Hydration time, viscosity development',
-                'equipment': 'Dispersing unit'
-            },
-            {
-                'step': 'Probiotic Inoculation',
-                'duration': 15,
-                'temp': 37,
-                'critical_params': 'Viable count, distribution uniformity',
-                'equipment': 'Sterile addition system'
-            },
-            {
-                'step': 'Controlled Fermentation',
-                'duration': 300,
-                'temp': 42,
-                'critical_params': 'pH development, probiotic activity',
-                'equipment': 'Research fermentation tank'
-            },
-            {
-                'step': 'Quality Control Testing',
-                'duration': 45,
-                'temp': 42,
-                'critical_params': 'CFU count, contaminant screening',
-                'equipment': 'Automated testing system'
-            },
-            {
-                'step': 'Research Packaging',
-                'duration': 35,
-                'temp': 5,
-                'critical_params': 'Sterile packaging, labeling',
-                'equipment': 'Research packaging unit'
-            }
-        ]
-        
-        # Create comprehensive process visualization
-        df_process = pd.DataFrame(process_steps)
-        
-        # Enhanced timeline chart
-        fig = px.timeline(
-            df_process,
-            x_start=[sum(df_process['duration'][:i]) for i in range(len(df_process))],
-            x_end=[sum(df_process['duration'][:i+1]) for i in range(len(df_process))],
-            y='step',
-            color='temp',
-            title=f"CapriX Research Production Timeline - {batch_size}L Batch (Total: {sum(df_process['duration'])} minutes)",
-            color_continuous_scale='RdYlBu_r',
-            hover_data=['critical_params', 'equipment']
-        )
-        
-        fig.update_layout(height=600, xaxis_title="Time (minutes)")
-        st.plotly_chart(fig, use_container_width=True)
-        
-        # Process details table
-        st.markdown("#### 📋 Process Step Details")
-        process_df = df_process[['step', 'duration', 'temp', 'critical_params', 'equipment']]
-        process_df.columns = ['Process Step', 'Duration (min)', 'Temperature (°C)', 'Critical Parameters', 'Equipment Required']
-        st.dataframe(process_df, use_container_width=True)
-    
-    # Research cost analysis
-    if include_analysis:
-        st.markdown("### 💰 Research Economics & Cost Analysis")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.markdown("#### Research Cost Breakdown (per 100mL)")
-            cost_components = {
-                'Component': [
-                    'Research-Grade Goat Milk', 'Premium Oils', 'Organic Date Sugar', 
-                    'Research Hydrocolloids', 'Probiotic Cultures', 'Equipment & Energy', 
-                    'Quality Testing', 'Research Packaging', 'R&D Overhead'
-                ],
-                'Cost ($)': [0.95, 0.35, 0.18, 0.12, 0.65, 0.28, 0.42, 0.15, 0.45],
-                'Percentage': [26.8, 9.9, 5.1, 3.4, 18.3, 7.9, 11.8, 4.2, 12.7]
-            }
-            
-            # Create research cost chart
-            fig_cost = px.pie(
-                values=cost_components['Cost ($)'],
-                names=cost_components['Component'],
-                title=f"CapriX Research Cost Structure - {research_type}",
-                color_discrete_sequence=px.colors.qualitative.Set3
-            )
-            fig_cost.update_traces(textposition='inside', textinfo='percent+label')
-            fig_cost.update_layout(height=400)
-            st.plotly_chart(fig_cost, use_container_width=True)
-        
-        with col2:
-            st.markdown("#### Research Scaling Analysis")
-            
-            # Research scaling economics
-            batch_ranges = [1, 5, 10, 25, 50]
-            costs_per_100ml = [3.55, 3.20, 2.95, 2.65, 2.45]
-            efficiency_scores = [65, 75, 85, 90, 95]
-            
-            # Create dual-axis chart
-            fig_scale = make_subplots(specs=[[{"secondary_y": True}]])
-            
-            fig_scale.add_trace(
-                go.Scatter(x=batch_ranges, y=costs_per_100ml, name="Cost per 100mL ($)", 
-                          line=dict(color='red', width=3), marker=dict(size=8)),
-                secondary_y=False,
-            )
-            
-            fig_scale.add_trace(
-                go.Scatter(x=batch_ranges, y=efficiency_scores, name="Research Efficiency (%)", 
-                          line=dict(color='green', width=3), marker=dict(size=8)),
-                secondary_y=True,
-            )
-            
-            fig_scale.update_xaxes(title_text="Research Batch Size (Liters)")
-            fig_scale.update_yaxes(title_text="Cost per 100mL ($)", secondary_y=False)
-            fig_scale.update_yaxes(title_text="Research Efficiency (%)", secondary_y=True)
-            fig_scale.update_layout(title="CapriX Research Economics: Scale vs Efficiency", height=400)
-            
-            st.plotly_chart(fig_scale, use_container_width=True)
-        
-        # Research metrics
-        st.markdown("#### 📈 Research Project Metrics")
-        
-        col1, col2, col3, col4 = st.columns(4)
-        
-        with col1:
-            research_cost = sum(cost_components['Cost ($)']) * batch_size * 10
-            st.metric("Research Budget", f"${research_cost:,.2f}", 
-                     delta=f"For {batch_size}L study")
-        with col2:
-            samples_produced = batch_size * 10  # 100mL samples
-            st.metric("Research Samples", f"{samples_produced}", 
-                     delta="For analysis")
-        with col3:
-            analysis_time = sum(df_process['duration']) / 60
-            st.metric("Production Time", f"{analysis_time:.1f} hours", 
-                     delta=f"Per {batch_size}L batch")
-        with col4:
-            quality_tests = 12  # Number of quality tests
-            st.metric("Quality Tests", f"{quality_tests}", 
-                     delta="Per batch")
+    _caprix_research_calculator()
 
 elif page == "📤 Export & Reports":
     st.markdown('<h2 class="sub-header">📊 Export & Comprehensive Reports</h2>', unsafe_allow_html=True)
     
     if st.session_state.current_recommendation:
-        rec = st.session_state.current_recommendation
-        
-        # Enhanced export interface
-        col1, col2 = st.columns([2, 1])
-        
-        with col1:
-            st.markdown("### 📋 Academic Report Generation")
-            
-            # Report customization options
-            report_sections = {
-                'Executive Summary': st.checkbox("Executive Summary", value=True, help="High-level recommendation overview"),
-                'Patient Assessment': st.checkbox("Patient Assessment", value=True, help="Detailed patient information and history"),
-                'Formula Specification': st.checkbox("Formula Specification", value=True, help="Complete nutritional composition"),
-                'Clinical Evidence': st.checkbox("Clinical Evidence", value=True, help="Supporting research and studies"),
-                'Safety Assessment': st.checkbox("Safety Assessment", value=True, help="Risk analysis and precautions"),
-                'Feeding Guidelines': st.checkbox("Feeding Guidelines", value=True, help="Detailed feeding instructions"),
-                'Research Notes': st.checkbox("Research Notes", value=False, help="Academic research considerations"),
-                'References': st.checkbox("Scientific References", value=True, help="Complete bibliography")
-            }
-            
-            # Report format and delivery options
-            col_a, col_b = st.columns(2)
-            with col_a:
-                report_format = st.selectbox(
-                    "Report Format",
-                    ["📄 Academic PDF", "📊 Research Excel", "📝 Clinical Document", 
-                     "🌐 HTML Report", "📋 Summary Report"]
-                )
-                
-                confidentiality = st.selectbox(
-                    "Confidentiality Level",
-                    ["Academic Use", "Research Data", "Clinical Study", "Confidential"]
-                )
-            
-            with col_b:
-                language = st.selectbox(
-                    "Report Language",
-                    ["English", "French", "Arabic", "Spanish"]
-                )
-                
-                template_style = st.selectbox(
-                    "Template Style",
-                    ["Academic Research", "Clinical Study", "Student Report", "Professional"]
-                )
-            
-            # Academic information
-            st.markdown("#### 🎓 Academic Information")
-            col_x, col_y = st.columns(2)
-            with col_x:
-                researcher_name = st.text_input("Researcher Name", placeholder="Chiali Z.")
-                supervisor_name = st.text_input("Supervisor", placeholder="Dr. Mohamed Merzoug")
-            with col_y:
-                institution = st.text_input("Institution", 
-                                          placeholder="Higher School of Biological Sciences of Oran",
-                                          value="Higher School of Biological Sciences of Oran")
-                study_purpose = st.selectbox("Study Purpose", 
-                                           ["Academic Research", "Thesis Project", "Clinical Study", "Course Project"])
-        
-        with col2:
-            st.markdown("### 📊 Report Preview")
-            
-            # Live preview metrics
-            if rec['is_caprix']:
-                st.markdown("""
-                <div class="metric-container">
-                    <div style="font-size: 1.2rem; font-weight: bold; color: #b8860b;">⭐ CapriX Research</div>
-                    <div style="font-size: 0.9rem; margin-top: 0.5rem;">Experimental Formula</div>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            confidence = rec.get('confidence_score', 85)
-            st.metric("Analysis Confidence", f"{confidence}%", 
-                     delta="Research grade" if confidence > 80 else "Requires validation")
-            
-            # Page count estimation
-            selected_sections = sum(report_sections.values())
-            estimated_pages = max(6, selected_sections * 2 + (2 if rec['is_caprix'] else 0))
-            st.metric("Estimated Pages", estimated_pages, f"{selected_sections} sections")
-            
-            # Generation time estimate
-            complexity_score = len(rec.get('probiotics', [])) + len(rec.get('safety_assessment', []))
-            est_time = max(20, complexity_score * 8)
-            st.metric("Generation Time", f"~{est_time}s", "Academic detail")
-        
-        # Report generation
-        st.markdown("### 🚀 Generate Academic Report")
-        
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            if st.button("📄 Generate Academic Report", type="primary", use_container_width=True):
-                with st.spinner("🔄 Generating comprehensive academic report..."):
-                    progress_bar = st.progress(0)
-                    
-                    # Simulate report generation with progress updates
-                    for i in range(101):
-                        time.sleep(0.015)  # Simulate processing time
-                        progress_bar.progress(i)
-                        if i == 25:
-                            st.info("📊 Compiling research data...")
-                        elif i == 50:
-                            st.info("🧪 Processing formula specifications...")
-                        elif i == 75:
-                            st.info("📚 Integrating academic references...")
-                    
-                    # Generate actual report content
-                    report_content = generate_academic_report(rec, report_sections, st.session_state.user_data, 
-                                                            researcher_name, supervisor_name, institution)
-                    
-                    st.success("✅ Academic report generated successfully!")
-                    
-                    # Download button
-                    st.download_button(
-                        label="📥 Download Academic Report",
-                        data=report_content,
-                        file_name=f"CapriX_Academic_Report_{datetime.datetime.now().strftime('%Y%m%d_%H%M')}.md",
-                        mime="text/markdown",
-                        use_container_width=True
-                    )
-        
-        with col2:
-            if st.button("📧 Share with Supervisor", use_container_width=True):
-                email_recipient = st.text_input("Supervisor Email", 
-                                              placeholder="merzoug.mohamed1@yahoo.fr",
-                                              value="merzoug.mohamed1@yahoo.fr")
-                if email_recipient:
-                    st.success(f"📧 Report prepared for sharing with {email_recipient}")
-                    st.info("Note: Please send manually via email")
-        
-        with col3:
-            if st.button("💾 Save to Research Database", use_container_width=True):
-                st.success("💾 Report saved to research database")
-                st.info("Note: Local storage for academic use")
-        
-        # Quick export options
-        st.markdown("### ⚡ Quick Export Options")
-        
-        col1, col2, col3, col4 = st.columns(4)
-        
-        with col1:
-            summary_data = f"""
-CAPRIX RESEARCH SUMMARY
-=======================
-Date: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M')}
-Researcher: {researcher_name if 'researcher_name' in locals() else 'CapriX Team'}
-Institution: Higher School of Biological Sciences of Oran
-
-PATIENT DATA:
-Age: {st.session_state.user_data.get('age', 'N/A')} months
-Weight: {st.session_state.user_data.get('weight', 'N/A')} kg
-Primary Diagnosis: {st.session_state.user_data.get('primary_diagnosis', 'None')}
-
-RECOMMENDED FORMULA:
-{rec['formula_base']['name']}
-Confidence Level: {rec.get('confidence_score', 85)}%
-Research Status: {'CapriX Exclusive Research Formula' if rec['is_caprix'] else 'Standard Medical Formula'}
-
-ACADEMIC NOTES:
-- This is a research project for academic purposes
-- All recommendations require medical supervision
-- Data for educational and research use only
-"""
-            st.download_button(
-                "📝 Research Summary",
-                data=summary_data,
-                file_name="caprix_research_summary.txt",
-                mime="text/plain",
-                use_container_width=True
-            )
-        
-        with col2:
-            if rec.get('probiotics'):
-                probiotic_data = "CAPRIX PROBIOTIC ANALYSIS\n" + "="*25 + "\n\n"
-                for p in rec['probiotics']:
-                    probiotic_data += f"Strain: {p['name']}\n"
-                    probiotic_data += f"Dosage: {p['dosage']}\n"
-                    probiotic_data += f"Evidence: {p['evidence_level']}\n"
-                    if p.get('caprix_exclusive'):
-                        probiotic_data += "Status: CapriX Exclusive\n"
-                    probiotic_data += f"Benefits: {p['benefits']}\n\n"
-                
-                st.download_button(
-                    "🦠 Probiotic Analysis",
-                    data=probiotic_data,
-                    file_name="caprix_probiotics.txt",
-                    mime="text/plain",
-                    use_container_width=True
-                )
-        
-        with col3:
-            feeding_data = f"""CAPRIX FEEDING PROTOCOL
-======================
-Date: {datetime.datetime.now().strftime('%Y-%m-%d')}
-
-FEEDING GUIDELINES:
-Daily Energy Needs: {rec['feeding_guide']['daily_energy_needs']} kcal
-Daily Volume: {rec['feeding_guide']['daily_volume']} ml
-Feeding Frequency: {rec['feeding_guide']['feeds_per_day']} times/day
-Volume per Feed: {rec['feeding_guide']['volume_per_feed']} ml
-
-RESEARCH NOTES:
-- Monitor infant response closely
-- Record feeding tolerance
-- Document any adverse reactions
-- Report findings to research team
-
-CONTACT:
-CapriX Team: caprix.startup@gmail.com
-Supervisor: merzoug.mohamed1@yahoo.fr
-"""
-            st.download_button(
-                "🍼 Feeding Protocol",
-                data=feeding_data,
-                file_name="caprix_feeding_protocol.txt",
-                mime="text/plain",
-                use_container_width=True
-            )
-        
-        with col4:
-            if rec.get('safety_assessment'):
-                safety_data = "CAPRIX SAFETY ASSESSMENT\n" + "="*23 + "\n\n"
-                safety_data += "IMPORTANT SAFETY CONSIDERATIONS:\n\n"
-                for i, warning in enumerate(rec['safety_assessment'], 1):
-                    safety_data += f"{i}. {warning}\n\n"
-                
-                safety_data += "\nACADEMIC DISCLAIMER:\n"
-                safety_data += "- This is an experimental research formula\n"
-                safety_data += "- Requires medical supervision for any use\n"
-                safety_data += "- For academic and research purposes only\n"
-                safety_data += "- Not for commercial distribution\n"
-                
-                st.download_button(
-                    "⚠️ Safety Assessment",
-                    data=safety_data,
-                    file_name="caprix_safety_assessment.txt",
-                    mime="text/plain",
-                    use_container_width=True
-                )
+        _export_workspace(st.session_state.current_recommendation, st.session_state.user_data)
     
     else:
         st.markdown("""
@@ -2145,61 +2973,12 @@ elif page == "ℹ️ About & Contact":
     col1, col2 = st.columns([2, 1])
     
     with col1:
-        st.markdown("""
-        ### 🍼 About CapriX Infant Formula Designer
-        
-        **CapriX** is an innovative startup initiative focused on the design and development of 
-        specialized infant milk formulas, primarily based on goat milk. The project also explores 
-        alternative milk sources, including plant-based ingredients, to address specific nutritional 
-        and medical needs in infants.
-        
-        #### 🎯 Mission Statement
-        To develop evidence-based, specialized infant nutrition solutions using advanced biotechnology 
-        and molecular biology approaches, with a focus on goat milk-based formulations for academic 
-        research and educational purposes.
-        
-        #### 🏫 Academic Foundation
-        This project is developed at the **Higher School of Biological Sciences of Oran** (École Supérieure 
-        en Sciences Biologiques d'Oran), Algeria, integrating cutting-edge research in:
-        - **Biotechnology** and **Molecular Biology**
-        - **Microbiology** and **Nutrition Science**
-        - **Infant Formula Development** and **Food Safety**
-        - **Probiotic Research** and **Functional Foods**
-        
-        #### 🔬 Research Focus Areas
-        - Goat milk-based infant formulations with enhanced digestibility
-        - Probiotic and prebiotic integration for gut health
-        - Alternative protein sources for specialized nutritional needs
-        - Nutritional optimization for medical conditions
-        - Academic research in infant nutrition science
-        """)
-    
-    with col2:
-        st.markdown("""
-        <div class="medical-card">
-            <h4>📊 Project Overview</h4>
-            <ul style="list-style: none; padding: 0;">
-                <li>🦠 <strong>8+</strong> Probiotic strains studied</li>
-                <li>🏥 <strong>6</strong> Medical conditions addressed</li>
-                <li>🧪 <strong>4</strong> Formula base types</li>
-                <li>📚 <strong>40+</strong> Scientific references</li>
-                <li>🌍 <strong>Multi-country</strong> research evidence</li>
-                <li>🎓 <strong>Academic</strong> research project</li>
-                <li>🔬 <strong>Research-grade</strong> formulations</li>
-                <li>📖 <strong>Educational</strong> purpose</li>
-            </ul>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_ABOUT_MISSION_MD)
+    
+    with col2:
+        st.html(_ABOUT_STATS_CARD_HTML)
         
-        st.markdown("""
-        <div class="caprix-exclusive" style="margin-top: 1rem; padding: 1rem;">
-            <h4>🌟 CapriX Innovation</h4>
-            <p style="margin: 0; font-size: 0.9rem;">
-                Pioneering goat milk formula technology for academic research 
-                and specialized infant nutrition studies
-            </p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.html(_ABOUT_INNOVATION_HTML)
     
     # Team and contact information
     st.markdown("---")
@@ -2208,67 +2987,13 @@ elif page == "ℹ️ About & Contact":
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        st.markdown("""
-        #### 🎓 Project Leadership
-        **Chiali Z.**  
-        Final-Year Student, Molecular Biology
-        
-        📧 **Team Contact:**  
-        caprix.startup@gmail.com
-        
-        🏫 **Institution:**  
-        Higher School of Biological Sciences of Oran  
-        (École Supérieure en Sciences Biologiques d'Oran)  
-        Algeria
-        
-        🔬 **Specialization:**  
-        • Infant Formula Development  
-        • Goat Milk Technology  
-        • Probiotic Research  
-        • Molecular Biology Applications
-        """)
+        st.markdown(_TEAM_LEADERSHIP_MD)
     
     with col2:
-        st.markdown("""
-        #### 👨‍🏫 Academic Supervision
-        **Dr. Mohamed Merzoug**  
-        Lecturer & App Development Supervisor
-        
-        📧 **Contact:**  
-        merzoug.mohamed1@yahoo.fr
-        
-        **Dr. H. Bouderbala**  
-        Lecturer & Project Supervisor
-        
-        🎯 **Combined Expertise:**  
-        • Biotechnology & Molecular Biology  
-        • Microbiology & Physiology  
-        • Nutrition Science & Food Technology  
-        • Research Methodology & Academic Supervision
-        """)
+        st.markdown(_TEAM_SUPERVISION_MD)
     
     with col3:
-        st.markdown("""
-        #### 📚 Academic Guidelines & Support
-        
-        ⚠️ **Important Notice:**  
-        This is a research and educational tool  
-        developed for academic purposes
-        
-        🏥 **Medical Consultation:**  
-        Always consult qualified pediatricians  
-        or infant nutrition specialists
-        
-        🔬 **Research Applications:**  
-        • Academic research projects  
-        • Educational demonstrations  
-        • Student learning exercises  
-        • Scientific methodology studies
-        
-        📖 **Intended Use:**  
-        Academic research and educational  
-        purposes only - not for clinical use
-        """)
+        st.markdown(_TEAM_GUIDELINES_MD)
     
     # Technical and version information
     st.markdown("---")
@@ -2277,50 +3002,10 @@ elif page == "ℹ️ About & Contact":
     col1, col2 = st.columns(2)
     
     with col1:
-        st.markdown("""
-        #### 📱 Application Technical Details
-        - **Version:** 2.0 - Enhanced Streamlit Edition
-        - **Build Date:** December 31, 2024
-        - **Platform:** Web-based Streamlit Application
-        - **Technology Stack:** Python, Streamlit, Plotly, Pandas
-        - **Database:** Enhanced medical evidence database
-        - **Security:** Academic-grade data protection
-        - **Compatibility:** Modern web browsers
-        - **Performance:** Optimized for research use
-        
-        #### 🔄 Recent Updates & Features
-        - Enhanced CapriX formula integration
-        - Improved academic interface design
-        - Advanced visualization capabilities
-        - Expanded evidence database
-        - Research-focused cost analysis tools
-        - Academic export and reporting features
-        """)
+        st.markdown(_TECHNICAL_DETAILS_MD)
     
     with col2:
-        st.markdown("""
-        #### 📜 Academic Compliance & Standards
-        - ✅ **WHO Guidelines** Referenced
-        - ✅ **Codex Alimentarius** Standards Reviewed
-        - ✅ **Academic Standards** Maintained
-        - ✅ **Research Ethics** Considered
-        - ✅ **Educational Purpose** Clearly Defined
-        - ✅ **Scientific Methodology** Applied
-        
-        #### 🎓 Educational Resources & Training
-        - Academic research methodology guidance
-        - Scientific reference integration
-        - Student-friendly interface design
-        - Educational content and explanations
-        - Research data export capabilities
-        - Academic documentation standards
-        
-        #### 📊 Research Applications
-        - Thesis and dissertation projects
-        - Academic course assignments
-        - Research methodology studies
-        - Nutritional science education
-        """)
+        st.markdown(_COMPLIANCE_MD)
     
     # Academic collaboration and feedback
     st.markdown("---")
@@ -2383,277 +3068,7 @@ elif page == "ℹ️ About & Contact":
     st.markdown("---")
     st.markdown("### ⚠️ Important Academic Disclaimer & Usage Guidelines")
     
-    st.markdown("""
-    <div class="medical-warning">
-        <h4>🎓 Academic Research Project Notice</h4>
-        <p><strong>This application is developed as part of an academic research project at the Higher School of Biological Sciences of Oran, Algeria.</strong></p>
-        
-        <h5>📚 Educational Purpose & Scope:</h5>
-        <ul>
-            <li><strong>Academic Research Tool:</strong> This application is designed exclusively for research and educational purposes</li>
-            <li><strong>Student Learning:</strong> Intended to support learning in molecular biology, nutrition science, and biotechnology</li>
-            <li><strong>Research Methodology:</strong> Demonstrates evidence-based approach to infant formula development</li>
-            <li><strong>Scientific Literature Review:</strong> Integrates current research findings and academic standards</li>
-        </ul>
-        
-        <h5>⚠️ Important Limitations & Requirements:</h5>
-        <ul>
-            <li><strong>Not for Clinical Use:</strong> This is NOT a medical device or clinical decision-support tool</li>
-            <li><strong>Medical Supervision Required:</strong> All formula recommendations must be reviewed by qualified pediatricians</li>
-            <li><strong>Research Data Only:</strong> Formulations are based on literature review and require clinical validation</li>
-            <li><strong>No Medical Advice:</strong> This application does not provide medical advice or replace professional consultation</li>
-            <li><strong>Experimental Status:</strong> CapriX formulations are experimental and for research purposes only</li>
-        </ul>
-        
-        <h5>🏥 Medical Emergency Guidance:</h5>
-        <p><strong>For Medical Emergencies:</strong> Contact your local pediatrician, healthcare provider, or emergency medical services immediately. This application is not intended for emergency medical situations.</p>
-        
-        <h5>📞 Academic Support:</h5>
-        <p><strong>For Academic Questions:</strong> Contact the CapriX team at caprix.startup@gmail.com or the supervising faculty at merzoug.mohamed1@yahoo.fr</p>
-    </div>
-    """, unsafe_allow_html=True)
-
-# Helper function for academic report generation
-def generate_academic_report(recommendation, sections, user_data, researcher="CapriX Team", supervisor="Dr. Mohamed Merzoug", institution="Higher School of Biological Sciences of Oran"):
-    """Generate a comprehensive academic report"""
-    report_content = f"""
-# CAPRIX INFANT FORMULA DESIGNER
-## Academic Research Report
-
----
-
-**Institution:** {institution}  
-**Researcher:** {researcher}  
-**Academic Supervisor:** {supervisor}  
-**Generated:** {datetime.datetime.now().strftime('%B %d, %Y at %H:%M')}  
-**Application Version:** CapriX Infant Formula Designer v2.0 - Streamlit Edition  
-**Report ID:** {datetime.datetime.now().strftime('%Y%m%d-%H%M%S')}
-
----
-
-## EXECUTIVE SUMMARY
-
-**Research Objective:** Develop evidence-based infant formula recommendations using advanced computational analysis and scientific literature review.
-
-**Formula Recommended:** {recommendation['formula_base']['name']}  
-**Analysis Confidence Level:** {recommendation.get('confidence_score', 85)}%  
-**Research Classification:** {'CapriX Experimental Research Formula' if recommendation['is_caprix'] else 'Standard Evidence-Based Formula'}
-
-### Key Research Findings
-- Comprehensive nutritional analysis completed based on WHO/Codex standards
-- Evidence-based probiotic selection from peer-reviewed literature
-- Personalized feeding guidelines calculated using established formulas
-- Safety assessment conducted according to academic standards
-- All recommendations require medical professional review before any application
-
----
-
-## PATIENT CASE STUDY PARAMETERS
-
-**Research Subject Profile:**  
-- **Age:** {user_data.get('age', 'Not specified')} months  
-- **Weight:** {user_data.get('weight', 'Not specified')} kg  
-- **Primary Medical Condition:** {user_data.get('primary_diagnosis', 'None specified')}  
-- **Secondary Conditions:** {', '.join(user_data.get('secondary_conditions', [])) if user_data.get('secondary_conditions') else 'None'}  
-- **Known Allergies:** {', '.join(user_data.get('allergies', [])) if user_data.get('allergies') else 'None reported'}
-
-### Clinical History Documentation
-**Feeding History:** {user_data.get('feeding_history', 'No feeding history provided')}
-
-**Family Medical History:** {user_data.get('family_history', 'No family history provided')}
-
-**Additional Clinical Notes:** {user_data.get('clinical_notes', 'No additional notes provided')}
-
----
-
-## FORMULA SPECIFICATION & ANALYSIS
-
-### Selected Formula: {recommendation['formula_base']['name']}
-
-**Academic Classification:** {recommendation['formula_base'].get('category', 'Standard')}  
-**Research Description:** {recommendation['formula_base']['description']}
-
-### Nutritional Composition Analysis (per 100ml)
-
-| Macronutrient | Amount | Unit | Source |
-|---------------|--------|------|---------|
-| **Energy** | {recommendation['composition']['energy']['amount']} | {recommendation['composition']['energy']['unit']} | Calculated total |
-| **Protein** | {recommendation['composition']['protein']['amount']} | {recommendation['composition']['protein']['unit']} | {recommendation['composition']['protein']['source']} |
-| **Fat** | {recommendation['composition']['fat']['amount']} | {recommendation['composition']['fat']['unit']} | {recommendation['composition']['fat']['source']} |
-| **Carbohydrates** | {recommendation['composition']['carbs']['amount']} | {recommendation['composition']['carbs']['unit']} | {recommendation['composition']['carbs']['source']} |
-
-### Regulatory Compliance Analysis
-- **WHO/UNICEF Guidelines:** Reviewed and considered in formulation
-- **Codex Alimentarius Standards:** Reference framework applied
-- **Academic Standards:** Research methodology follows established protocols
-- **Safety Assessment:** Comprehensive risk analysis conducted
-
----
-
-## PROBIOTIC RESEARCH ANALYSIS
-
-### Evidence-Based Probiotic Selection
-"""
-    
-    if recommendation.get('probiotics'):
-        report_content += "\n| Probiotic Strain | Dosage | Evidence Level | Clinical Benefits | Research References |\n"
-        report_content += "|------------------|--------|----------------|-------------------|--------------------|\n"
-        for probiotic in recommendation['probiotics']:
-            caprix_note = " (CapriX Exclusive)" if probiotic.get('caprix_exclusive') else ""
-            report_content += f"| **{probiotic['name']}{caprix_note}** | {probiotic['dosage']} | {probiotic['evidence_level']} | {probiotic['benefits'][:60]}... | {probiotic['references']} |\n"
-    else:
-        report_content += "\nNo specific probiotics recommended for this case study.\n"
-    
-    report_content += f"""
-
-### Probiotic Research Rationale
-The probiotic selection was based on systematic literature review and evidence-based medicine principles. Each strain was evaluated for:
-- Clinical efficacy in peer-reviewed studies
-- Safety profile in infant populations
-- Mechanism of action and biological plausibility
-- Dosage recommendations from clinical trials
-
----
-
-## FEEDING PROTOCOL & GUIDELINES
-
-### Calculated Feeding Recommendations
-
-| Parameter | Value | Calculation Basis |
-|-----------|-------|-------------------|
-| **Daily Energy Requirements** | {recommendation['feeding_guide']['daily_energy_needs']} kcal | Age and weight-adjusted formula |
-| **Total Daily Volume** | {recommendation['feeding_guide']['daily_volume']} ml | Energy density calculation |
-| **Feeding Frequency** | {recommendation['feeding_guide']['feeds_per_day']} times per day | Age-appropriate intervals |
-| **Volume per Feed** | {recommendation['feeding_guide']['volume_per_feed']} ml | Total volume divided by frequency |
-
-### Research Monitoring Protocol
-For academic research purposes, the following monitoring is recommended:
-- Daily weight gain tracking (target: 15-30g/day)
-- Feeding tolerance assessment
-- Documentation of any adverse reactions
-- Growth velocity monitoring according to WHO standards
-
----
-
-## SAFETY ASSESSMENT & RISK ANALYSIS
-
-### Comprehensive Safety Evaluation
-"""
-    
-    if recommendation.get('safety_assessment'):
-        for i, warning in enumerate(recommendation['safety_assessment'], 1):
-            report_content += f"{i}. {warning}\n"
-    
-    report_content += f"""
-
-### Academic Research Considerations
-- This formulation is developed for research and educational purposes
-- All recommendations require review by qualified medical professionals
-- Clinical validation would be necessary before any practical application
-- Regulatory approval required for commercial development
-
----
-
-## SCIENTIFIC RATIONALE & RESEARCH METHODOLOGY
-
-### Evidence-Based Decision Making
-{recommendation.get('recommendation_rationale', 'The formula recommendation was developed using evidence-based principles, integrating current scientific literature and established nutritional guidelines.')}
-
-### Research Methodology
-The CapriX Infant Formula Designer employs:
-1. **Systematic Literature Review:** Integration of peer-reviewed research
-2. **Evidence Grading:** Classification of clinical evidence quality
-3. **Risk Assessment:** Comprehensive safety evaluation
-4. **Nutritional Modeling:** WHO/Codex standard compliance checking
-5. **Personalization Algorithms:** Age and weight-adjusted calculations
-
----
-
-## ACADEMIC REFERENCES & BIBLIOGRAPHY
-
-### Primary Clinical Guidelines
-- World Health Organization (WHO). Infant and young child feeding guidelines
-- American Academy of Pediatrics (AAP). Clinical reports on infant nutrition
-- European Society for Paediatric Gastroenterology Hepatology and Nutrition (ESPGHAN)
-- Codex Alimentarius Commission. Standard for infant formula and formulas for special medical purposes
-
-### Probiotic Research Literature
-"""
-    
-    if recommendation.get('probiotics'):
-        for probiotic in recommendation['probiotics']:
-            report_content += f"- {probiotic['references']} - {probiotic['name']} clinical evidence\n"
-    
-    report_content += f"""
-
-### CapriX Research References
-- PMC9525539: Development and characterization of lactose-free probiotic goat milk beverages
-- EP3138409A1: Method for production of a fermented goat's milk beverage
-- CapriX Clinical Study CX-2024-001: Multi-center trial results (in progress)
-
----
-
-## RESEARCH CONCLUSIONS & FUTURE DIRECTIONS
-
-### Key Academic Findings
-1. **Computational Analysis:** Successful integration of evidence-based algorithms for personalized recommendations
-2. **Safety Framework:** Comprehensive risk assessment methodology developed
-3. **Educational Value:** Effective demonstration of nutritional science principles
-4. **Research Applications:** Platform suitable for academic research and student learning
-
-### Recommendations for Future Research
-- Clinical validation studies of computational recommendations
-- Long-term outcomes assessment of personalized formulations
-- Expansion of probiotic database with emerging research
-- Integration of additional nutritional biomarkers
-
-### Academic Impact
-This research contributes to:
-- **Nutritional Science Education:** Practical application of theoretical knowledge
-- **Research Methodology:** Evidence-based computational approaches
-- **Innovation in Food Technology:** Novel approaches to infant nutrition
-- **Academic Collaboration:** Platform for multi-institutional research
-
----
-
-## ACADEMIC DISCLAIMER & ETHICAL CONSIDERATIONS
-
-### Research Ethics Statement
-This academic project adheres to ethical research principles:
-- **Educational Purpose:** Designed exclusively for learning and research
-- **No Clinical Application:** Not intended for direct medical use
-- **Professional Oversight:** Developed under academic supervision
-- **Transparency:** Open methodology and evidence-based approach
-
-### Limitations & Future Development
-- **Validation Required:** Clinical studies needed for practical application
-- **Regulatory Compliance:** Commercial development requires regulatory approval
-- **Medical Supervision:** All applications must involve healthcare professionals
-- **Continuous Updates:** Research database requires ongoing maintenance
-
----
-
-## CONTACT INFORMATION & ACADEMIC SUPPORT
-
-**CapriX Research Team**  
-Higher School of Biological Sciences of Oran  
-Algeria  
-
-**Primary Contact:** caprix.startup@gmail.com  
-**Academic Supervisor:** merzoug.mohamed1@yahoo.fr  
-
-**For Academic Collaborations:** Contact the research team for potential joint projects or educational partnerships.
-
----
-
-*This report was generated by the CapriX Infant Formula Designer v2.0 for academic research and educational purposes. All content is based on scientific literature review and computational analysis. Medical supervision is required for any practical applications.*
-
-**Generated on:** {datetime.datetime.now().strftime('%B %d, %Y at %H:%M')}  
-**Report Classification:** Academic Research Document  
-**Distribution:** For educational and research use only
-"""
-    
-    return report_content
+    st.markdown(_ACADEMIC_DISCLAIMER_HTML, unsafe_allow_html=True)
 
 # Application metadata and final setup
 __version__ = "2.0.1"
@@ -2675,9 +3090,7 @@ DEPLOYMENT_CONFIG = {
     "medical_supervision_required": True
 }
 
-# Application Footer
-st.markdown("---")
-st.markdown("""
+_FOOTER_HTML: Final[str] = """
 <div class="footer">
     <div style="display: flex; justify-content: space-between; align-items: center; flex-wrap: wrap; gap: 2rem;">
         <div>
@@ -2712,42 +3125,53 @@ st.markdown("""
             All recommendations require medical supervision and are not for clinical use.
         </p>
         <p style="margin: 0.5rem 0 0 0; font-size: 0.8rem; opacity: 0.7;">
-            📧 Contact: caprix.startup@gmail.com • 👨‍🏫 Supervisor: merzoug.mohamed1@yahoo.fr
+            📧 Contact: <a href="mailto:caprix.startup@gmail.com" style="color: inherit;">caprix.startup@gmail.com</a> • 👨‍🏫 Supervisor: <a href="mailto:merzoug.mohamed1@yahoo.fr" style="color: inherit;">merzoug.mohamed1@yahoo.fr</a>
         </p>
     </div>
 </div>
-""", unsafe_allow_html=True)
+"""
+
+# Application Footer (pure HTML, so st.html skips the markdown pass)
+st.markdown("---")
+st.html(_FOOTER_HTML)
 
 # Application health check and final setup
 def main():
     """Main application entry point with error handling"""
     try:
-        # Initialize application state
-        if 'app_initialized' not in st.session_state:
-            st.session_state.app_initialized = True
-            st.session_state.app_start_time = datetime.datetime.now()
-        
-        # Add session management
-        if 'session_id' not in st.session_state:
-            st.session_state.session_id = f"CAPRIX_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        # Initialize application state and session management
+        started = datetime.datetime.now()
+        st.session_state.app_start_time = started
+        st.session_state.session_id = f"CAPRIX_{started.strftime('%Y%m%d_%H%M%S')}"
+        st.session_state.app_initialized = True
+        print(f"CapriX Infant Formula Designer v{__version__} - Ready for academic deployment")
         
     except Exception as e:
         st.error(f"Application Error: {str(e)}")
         st.info("Please refresh the page or contact the CapriX team.")
 
+@st.fragment
+def _system_info_panel():
+    """Sidebar system information, toggled without rerunning the whole page"""
+    if st.button("ℹ️ System Info"):
+        st.session_state.show_system_info = not st.session_state.get('show_system_info', False)
+    if st.session_state.get('show_system_info'):
+        st.markdown("### 🖥️ System Information")
+        st.text(f"Python: {sys.version.split()[0]}")
+        st.text(f"Streamlit: {st.__version__}")
+        st.text(f"Session: {st.session_state.get('session_id', 'N/A')[-8:]}")
+        st.success("✅ Academic system operational")
+
 # Final application execution
 if __name__ == "__main__":
     try:
-        # Run main application
-        main()
+        # Session bootstrap runs once; later reruns skip straight to the page
+        if not st.session_state.get('app_initialized'):
+            main()
         
         # Add system information for debugging
-        if st.sidebar.button("ℹ️ System Info"):
-            st.sidebar.markdown("### 🖥️ System Information")
-            st.sidebar.text(f"Python: {sys.version.split()[0]}")
-            st.sidebar.text(f"Streamlit: {st.__version__}")
-            st.sidebar.text(f"Session: {st.session_state.get('session_id', 'N/A')[-8:]}")
-            st.sidebar.success("✅ Academic system operational")
+        with st.sidebar:
+            _system_info_panel()
     
     except Exception as e:
         st.error("🚨 Critical Application Error")
@@ -2764,6 +3188,3 @@ if __name__ == "__main__":
         
         Please include your session ID: `{}`
         """.format(st.session_state.get('session_id', 'unknown')))
-
-# End of application
-print(f"CapriX Infant Formula Designer v{__version__} - Ready for academic deployment")